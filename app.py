@@ -16,7 +16,7 @@ server = app.server
 
 # Connect to app pages
 
-from apps import home, itesm, callbacks
+from apps import home, itesm, callbacks, layers, tiles, memo, procmem, metrics, serializer, compression, figure_cache
 
 # App Layout
 
@@ -40,6 +40,13 @@ app.layout = html.Div([
 
 ])
 
+layers.init_app(server)
+tiles.init_app(server)
+memo.init_app(server)
+procmem.init_app(server)
+compression.init_app(server)
+metrics.init_app(app)
+serializer.init_app(app)
 callbacks.assign_callbacks(app)
 
 @app.callback(
@@ -48,10 +55,12 @@ callbacks.assign_callbacks(app)
 
 def display_page(pathname):
 	if pathname == '/apps/radiografia-urbana':
-		return itesm.layout
+		return itesm.serve_layout()
 	else:
 		return home.layout
 
+figure_cache.cache_responses(app, 'page-content.children')
+
 
 if __name__ == '__main__':
 	app.run_server(debug=True)
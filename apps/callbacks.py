@@ -1,12 +1,12 @@
 import os
+import json
 from dotenv import load_dotenv
-from dash.dependencies import Input, Output
-import plotly.express as px
+from dash.dependencies import Input, Output, State, ClientsideFunction
+from dash.exceptions import PreventUpdate
 import plotly.graph_objects as go
 import pandas as pd
-import json
 import numpy as np
-from shapely.geometry import shape
+from apps import data, geometry, layers, tiles, figure_cache, memo
 
 load_dotenv()
 mapbox_token = os.getenv("MAPBOX_TOKEN")
@@ -15,58 +15,200 @@ center_k1 = { 'lon': -100.4068401068442, 'lat': 25.673275441075}
 
 # Load files
 ## geojsons
-sector_k1_polygon = json.load(open("src_files/sector_k1.geojson"))
-sector_k1_av = json.load(open("src_files/av_k1.geojson"))
-sector_k1_inegi = json.load(open("src_files/inegi_k1.geojson"))
+sector_k1_inegi = data.geojson("inegi_k1")
 
 ## csv 
-df_inegi_av = pd.read_csv("src_files/inegi_av_98.csv") #union of green areas and inegi
-df_inegi_av_demo = pd.read_csv("src_files/inegi_av_98.csv") #union of green areas and inegi
-df_av_denue_rank = pd.read_csv("src_files/denue_ranking.csv") #union of green areas and denue with ranking
+df_inegi_av = data.frame("inegi_av_98") #union of green areas and inegi
+df_inegi_av_demo = data.frame("inegi_av_98") #union of green areas and inegi, population columns already cleaned
+df_av_denue_rank = data.frame("denue_ranking") #union of green areas and denue with ranking
 
 ## helper file
-park_name_features = json.load(open("src_files/park_names_features.json"))
+park_name_features = data.geojson("park_names_features")
+park_views = geometry.park_views(park_name_features) #center, bounds and zoom of every park
 
 ##prepare inegi data
+df_inegi_av.rename(columns={"POBTOT": "población", "POBFEM": "mujeres", "POBMAS": "hombres", "VIVTOT": "viviendas"}, inplace=True)
+df_inegi_av["densidad poblacional"] = df_inegi_av["población"] / df_inegi_av["area"]
+services_map_hover_data = ["población","mujeres","hombres","area", "distancia", "viviendas", "densidad poblacional"]
+
+##population by age bin of every park, the 8 female bins followed by the 8 male bins
+age_bins_fem = ['P_0A2_F', 'P_3A5_F','P_6A11_F', 'P_12A14_F', 'P_15A17_F', 'P_18A24_F', 'P_25A59_F', 'P_60YMAS_F']
+age_bins_mas = ['P_0A2_M', 'P_3A5_M','P_6A11_M', 'P_12A14_M', 'P_15A17_M', 'P_18A24_M', 'P_25A59_M', 'P_60YMAS_M']
+df_age_pyramid = df_inegi_av_demo.groupby('NOMBRE_PARQUE')[[col for col in age_bins_fem + age_bins_mas if "25A59" not in col] + ['POBFEM', 'POBMAS']].sum()
 #calculate female and male data for 25 to 59 years
-for col in ['P_0A2_F', 'P_3A5_F','P_6A11_F', 'P_12A14_F', 'P_15A17_F', 'P_18A24_F',  'P_60YMAS_F','POBFEM']:
-    df_inegi_av_demo[col] = df_inegi_av_demo[col].fillna(0).replace("*", 0).astype(int)
+df_age_pyramid['P_25A59_F'] = df_age_pyramid['POBFEM'] - df_age_pyramid[[col for col in age_bins_fem if col != 'P_25A59_F']].sum(axis=1)
+df_age_pyramid['P_25A59_M'] = df_age_pyramid['POBMAS'] - df_age_pyramid[[col for col in age_bins_mas if col != 'P_25A59_M']].sum(axis=1)
+age_pyramid_matrix = df_age_pyramid[age_bins_fem + age_bins_mas].to_numpy(dtype=np.int64)
+age_pyramid_rows = {park: i for i, park in enumerate(df_age_pyramid.index)}
 
-for col in ['P_0A2_M', 'P_3A5_M','P_6A11_M', 'P_12A14_M', 'P_15A17_M', 'P_18A24_M',  'P_60YMAS_M','POBMAS']:
-    df_inegi_av_demo[col] = df_inegi_av_demo[col].fillna(0).replace("*", 0).astype(int)
+def age_pyramid(parks):
+    '''
+    Returns the female and male population by age bin of the people near one or many parks
+    '''
+    rows = [age_pyramid_rows[park] for park in parks if park in age_pyramid_rows]
+    totals = age_pyramid_matrix[rows].sum(axis=0)
+    return totals[:len(age_bins_fem)], totals[len(age_bins_fem):]
 
-df_inegi_av.rename(columns={"POBTOT": "población", "POBFEM": "mujeres", "POBMAS": "hombres", "VIVTOT": "viviendas"}, inplace=True)
-df_inegi_av.fillna(0, inplace=True)
-df_inegi_av.replace("*", 0, inplace=True)
+##positions of the rows of every park, so the services map does not scan or copy the whole frames
+av_denue_rank_rows = data.partition(df_av_denue_rank, "NOMBRE_PARQUE")
+inegi_av_rows = data.partition(df_inegi_av, "NOMBRE_PARQUE")
+no_rows = np.arange(0)
 
-df_inegi_av["mujeres"] = df_inegi_av["mujeres"].astype(int)
-df_inegi_av["hombres"] = df_inegi_av["hombres"].astype(int)
-df_inegi_av["densidad poblacional"] = df_inegi_av["población"] / df_inegi_av["area"]
+def park_rows(df, rows_by_park, park):
+    '''
+    Returns the rows of df of a park, empty when it has none
+    '''
+    return df.iloc[rows_by_park.get(park, no_rows)]
+
+##services sunburst tree (TIPOLOGIA -> park -> activity) aggregated once. Parks are ranked by number of
+##services and the nodes are stored in that order, so the nodes of the top or bottom N parks are slices
+services_park_order = df_av_denue_rank.sort_values('cantidad de servicios', ascending=False)['NOMBRE_PARQUE'].unique()
+services_park_rank = pd.Series(np.arange(len(services_park_order)), index=services_park_order)
+services_colors = np.array(['#590E0E', '#8C1616', '#CC730E', '#D6900F', '#FFC71F', '#FFE359', '#E4F279',  "#BDB655", "#9CA653", "#6C7339"])
+
+###activities (leaves) grouped by park and tipologia, parks in rank order
+services_leaves = df_av_denue_rank.groupby(['NOMBRE_PARQUE', 'TIPOLOGIA', 'nombre_act']).size().reset_index(name='value')
+services_leaves['rank'] = services_park_rank[services_leaves['NOMBRE_PARQUE']].to_numpy()
+services_leaves = services_leaves.sort_values(['rank', 'TIPOLOGIA', 'nombre_act'], kind='mergesort', ignore_index=True)
+services_leaves['branch'] = services_leaves.groupby(['rank', 'TIPOLOGIA'], sort=False).ngroup()
+
+###park of a tipologia (branches), the leaves of branch i are leaf_bounds[i]:leaf_bounds[i + 1]
+services_branches = services_leaves.groupby('branch').agg(
+    NOMBRE_PARQUE=('NOMBRE_PARQUE', 'first'), TIPOLOGIA=('TIPOLOGIA', 'first'), rank=('rank', 'first'), value=('value', 'sum'))
+services_tipologias, services_branch_tipologia = np.unique(services_branches['TIPOLOGIA'].to_numpy(), return_inverse=True)
+services_branch_ids = (services_branches['TIPOLOGIA'] + '/' + services_branches['NOMBRE_PARQUE']).to_numpy()
+services_sunburst = {
+    'leaf_ids': services_branch_ids[services_leaves['branch']] + '/' + services_leaves['nombre_act'].to_numpy(),
+    'leaf_parents': services_branch_ids[services_leaves['branch']],
+    'leaf_labels': services_leaves['nombre_act'].to_numpy(),
+    'leaf_values': services_leaves['value'].to_numpy(),
+    'leaf_bounds': np.searchsorted(services_leaves['branch'].to_numpy(), np.arange(len(services_branches) + 1)),
+    'branch_ids': services_branch_ids,
+    'branch_labels': services_branches['NOMBRE_PARQUE'].to_numpy(),
+    'branch_values': services_branches['value'].to_numpy(),
+    'branch_rank': services_branches['rank'].to_numpy(),
+    'branch_tipologia': services_branch_tipologia,
+}
+###branches of the park of rank i are park_bounds[i]:park_bounds[i + 1]
+services_park_bounds = np.searchsorted(services_sunburst['branch_rank'], np.arange(len(services_park_order) + 1))
+
+services_branch_index = {branch_id: i for i, branch_id in enumerate(services_sunburst['branch_ids'])}
+
+def services_branches_slice(top, is_top):
+    '''
+    Returns the number and rank of the first of the top (or bottom) parks and the slice of their branches
+    '''
+    top = max(0, min(top, len(services_park_order)))
+    first = 0 if is_top else len(services_park_order) - top
+    return top, first, slice(services_park_bounds[first], services_park_bounds[first + top])
+
+def services_sunburst_nodes(top, is_top):
+    '''
+    Returns the ids, parents, labels, values and colors of the tipologia and park nodes of the
+    sunburst of the top (or bottom) parks by number of services, every park with its own color.
+    The activities are loaded by services_sunburst_children when a node is opened.
+    '''
+    tree = services_sunburst
+    top, first, branches = services_branches_slice(top, is_top)
+
+    branch_tipologia = tree['branch_tipologia'][branches]
+    branch_colors = services_colors[(tree['branch_rank'][branches] - first) % len(services_colors)]
+    ## a tipologia takes the color of its park, or the next one when it has several parks
+    roots, first_branch, parks = np.unique(branch_tipologia, return_index=True, return_counts=True)
+    root_colors = np.where(parks == 1, branch_colors[first_branch], services_colors[top % len(services_colors)])
+
+    return {
+        'ids': np.concatenate([tree['branch_ids'][branches], services_tipologias[roots]]),
+        'parents': np.concatenate([services_tipologias[branch_tipologia], np.full(len(roots), '')]),
+        'labels': np.concatenate([tree['branch_labels'][branches], services_tipologias[roots]]),
+        'values': np.concatenate([tree['branch_values'][branches], np.bincount(branch_tipologia, weights=tree['branch_values'][branches])[roots].astype(int)]),
+        'colors': np.concatenate([branch_colors, root_colors]),
+    }
+
+def services_sunburst_children(node_id, top, is_top):
+    '''
+    Returns the ids, parents, labels and values of the activities shown when a node of the
+    sunburst is opened: the activities of a park, or of every park of a tipologia
+    '''
+    tree = services_sunburst
+    if node_id in services_branch_index:
+        branches = [services_branch_index[node_id]]
+    else:
+        _, _, selected = services_branches_slice(top, is_top)
+        branches = selected.start + np.flatnonzero(services_tipologias[tree['branch_tipologia'][selected]] == node_id)
+    leaves = np.concatenate([np.arange(tree['leaf_bounds'][i], tree['leaf_bounds'][i + 1]) for i in branches] or [np.arange(0)])
+    return {
+        'ids': tree['leaf_ids'][leaves],
+        'parents': tree['leaf_parents'][leaves],
+        'labels': tree['leaf_labels'][leaves],
+        'values': tree['leaf_values'][leaves],
+    }
+
+##simplified polygons for the level of detail of each map
+inegi_bounds = geometry.bounds_array(sector_k1_inegi)
+sector_bounds = (*inegi_bounds[:, :2].min(axis=0), *inegi_bounds[:, 2:].max(axis=0))
+overview_level = geometry.level_for_zoom(geometry.fit_zoom(sector_bounds, size_px=geometry.OVERVIEW_SIZE_PX, min_zoom=0, max_zoom=22))
+overview_inegi = data.geojson("inegi_k1", overview_level)
+overview_av = data.geojson("av_k1", overview_level)
+
+park_levels = {park: geometry.level_for_zoom(park_view['zoom']) for park, park_view in park_views.items()}
+inegi_by_level = {level: data.geojson("inegi_k1", level) for level in set(park_levels.values())}
+av_by_level = {level: data.geojson("av_k1", level) for level in set(park_levels.values())}
+inegi_features = {level: geometry.features_by_property(layer, "CVEGEO") for level, layer in inegi_by_level.items()}
+av_features = {level: geometry.features_by_property(layer, "UNION") for level, layer in av_by_level.items()}
+
+##polygon layers served as cacheable static files, the figures only carry their urls
+overview_inegi_url = layers.register("inegi_k1.lod%d" % overview_level, overview_inegi)
+overview_av_url = layers.register("av_k1.lod%d" % overview_level, overview_av)
+
+park_geojsons = {}
+for park in park_views:
+    level = park_levels[park]
+    park_inegi = park_rows(df_inegi_av, inegi_av_rows, park)
+    park_denue = park_rows(df_av_denue_rank, av_denue_rank_rows, park)
+    park_geojsons[park] = {
+        #polygons used by the traces
+        'inegi': layers.register("inegi_k1.lod%d" % level, geometry.feature_collection(inegi_features[level][cvegeo] for cvegeo in park_inegi["inegi_cvegeo"].astype(str).unique() if cvegeo in inegi_features[level])),
+        'av': layers.register("av_k1.lod%d" % level, geometry.feature_collection(av_features[level][union] for union in park_denue["av_union"].astype(str).unique() if union in av_features[level])),
+    }
+
+#the layers keep the polygons encoded, the parsed ones are only needed to register them
+del sector_k1_inegi, park_name_features, overview_inegi, overview_av, inegi_by_level, av_by_level, inegi_features, av_features
 
 def assign_callbacks(app):
     @app.callback(
-        Output('map_services_by_park', 'figure'),
-        [Input('select_service_by_park', 'value'), Input('radio_filter', 'value'), Input('switches_servicios', 'value')]
+        Output('map_services_by_park_base', 'data'),
+        Input('select_service_by_park', 'value')
         
     )
-    def generate_map_services(selected_park, radio_filter, switches_servicios):
+    @memo.memoize()
+    def generate_map_services(selected_park):
         ''''
-        Generates map of green areas with inegi and denue data by GA
+        Generates map of green areas with inegi and denue data by GA.
+        The color of the inegi data comes from generate_map_services_colors
         '''
         #filter denue data
-        df_av_denue_rank_filter = df_av_denue_rank[df_av_denue_rank["NOMBRE_PARQUE"] == selected_park]
+        df_av_denue_rank_filter = park_rows(df_av_denue_rank, av_denue_rank_rows, selected_park)
 
         #filter inegi data
-        df_inegi_av_filter = df_inegi_av[df_inegi_av['NOMBRE_PARQUE'] == selected_park]
+        df_inegi_av_filter = park_rows(df_inegi_av, inegi_av_rows, selected_park)
 
         #load inegi near 400mts 
-        fig = px.choropleth_mapbox(
-            df_inegi_av_filter, 
-            geojson=sector_k1_inegi, color=radio_filter,
-            locations="inegi_cvegeo", 
-            featureidkey="properties.CVEGEO", 
-            color_continuous_scale=['#590E0E', '#8C1616', '#CC730E', '#D6900F', '#FFC71F', '#FFE359', '#E4F279',  "#BDB655", "#9CA653", "#6C7339"],
-            hover_data=["población","mujeres","hombres","area", "distancia", "viviendas", "densidad poblacional"],
+        fig = go.Figure(
+            go.Choroplethmapbox(
+                uid="inegi",
+                geojson=park_geojsons[selected_park]['inegi'],
+                locations=df_inegi_av_filter["inegi_cvegeo"],
+                featureidkey="properties.CVEGEO",
+                coloraxis="coloraxis",
+                customdata=df_inegi_av_filter[services_map_hover_data],
+                hovertemplate="inegi_cvegeo=%{location}<br>" + "<br>".join("%s=%%{customdata[%d]}" % (col, i) for i, col in enumerate(services_map_hover_data)) + "<extra></extra>",
+                name="",
+            )
+        )
+        fig.update_layout(
+            coloraxis={'colorscale': ['#590E0E', '#8C1616', '#CC730E', '#D6900F', '#FFC71F', '#FFE359', '#E4F279',  "#BDB655", "#9CA653", "#6C7339"]},
+            meta={'park': selected_park},
         )
         
         #load services near 400mts
@@ -84,14 +226,13 @@ def assign_callbacks(app):
             textposition = "bottom right",
             textfont={"size": 16, "color": "#003952", },
             name="servicios",
-            visible="services" in switches_servicios
             )
         )
 
         #load selected green areas
         fig.add_trace(
             go.Choroplethmapbox(
-                geojson=sector_k1_av,
+                geojson=park_geojsons[selected_park]['av'],
                 locations=df_av_denue_rank_filter['av_union'],
                 featureidkey="properties.UNION",
                 z=df_av_denue_rank_filter["ranking"],
@@ -106,28 +247,22 @@ def assign_callbacks(app):
             )
         )
 
-        #get center of the green area
-        s = shape(park_name_features[selected_park][0]['geometry'])
-        centroid = s.centroid
-        center = { 'lon': centroid.x, 'lat': centroid.y}
+        #get center and zoom of the green area
+        park_view = park_views[selected_park]
         
         fig.update_layout(
             mapbox = {
                 'accesstoken': mapbox_token,
                 'style': mapbox_style, 
-                'center': center, 
-                'zoom': 15, 'layers': [
+                'center': park_view['center'], 
+                'zoom': park_view['zoom'], 'layers': [
                     {
-                    'source': {
-                        'type': "FeatureCollection",
-                        'features': sector_k1_inegi["features"] #show all the inegi data
-                    },
+                    'sourcetype': "vector", 'sourcelayer': "inegi_k1",
+                    'source': [tiles.tile_url("inegi_k1")], #show all the inegi data
                     'type': "fill", 'color': "#B8CBCC",'below': "traces",},
                     {
-                    'source': {
-                        'type': "FeatureCollection",
-                        'features': sector_k1_av['features'] #show all the green areas
-                    },
+                    'sourcetype': "vector", 'sourcelayer': "av_k1",
+                    'source': [tiles.tile_url("av_k1")], #show all the green areas
                     'type': "fill", 'color': "#85A3CA", 'below': "traces"},
                     ]
                     },
@@ -137,12 +272,34 @@ def assign_callbacks(app):
 
         return fig
 
+    @app.callback(
+        Output('map_services_by_park_colors', 'data'),
+        [Input('select_service_by_park', 'value'), Input('radio_filter', 'value')]
+    )
+    @memo.memoize()
+    def generate_map_services_colors(selected_park, radio_filter):
+        '''
+        Values of radio_filter that color the inegi data of the park map, only these are
+        sent when the filter changes
+        '''
+        df_inegi_av_filter = park_rows(df_inegi_av, inegi_av_rows, selected_park)
+        return {'park': selected_park, 'z': df_inegi_av_filter[radio_filter].tolist(), 'title': radio_filter}
+
+    #the park map is assembled in the browser from the figure of the park and the colors of the filter,
+    #showing or hiding the services only restyles their trace
+    app.clientside_callback(
+        ClientsideFunction(namespace='implang', function_name='update_services_map'),
+        Output('map_services_by_park', 'figure'),
+        [Input('map_services_by_park_base', 'data'), Input('map_services_by_park_colors', 'data'), Input('switches_servicios', 'value')]
+    )
+
     @app.callback(
         Output('map_ranking_park', 'figure'),
         Input('radio_ranking_filter', 'value')
         
     )
-    def generate_map_services(radio_ranking_filter):
+    @memo.memoize()
+    def generate_map_ranking(radio_ranking_filter):
         ''''
         Generates map of all green areas
         '''
@@ -151,7 +308,7 @@ def assign_callbacks(app):
         fig.add_trace(
             go.Choropleth(
                 uid="inegi",
-                geojson=sector_k1_inegi,
+                geojson=overview_inegi_url,
                 locations=df_inegi_av["inegi_cvegeo"],
                 featureidkey="properties.CVEGEO",
                 z=df_inegi_av["distancia"],
@@ -167,7 +324,7 @@ def assign_callbacks(app):
             fig.add_trace(
                 go.Choropleth(
                     uid="parks",
-                    geojson=sector_k1_av,
+                    geojson=overview_av_url,
                     locations=df_av_denue_rank["av_union"],
                     featureidkey="properties.UNION",
                     z=df_av_denue_rank[radio_ranking_filter].factorize()[0],
@@ -187,7 +344,7 @@ def assign_callbacks(app):
             fig.add_trace(
                 go.Choropleth(
                     uid="parks",
-                    geojson=sector_k1_av,
+                    geojson=overview_av_url,
                     locations=df_av_denue_rank["av_union"],
                     featureidkey="properties.UNION",
                     z=df_av_denue_rank[radio_ranking_filter],
@@ -205,24 +362,21 @@ def assign_callbacks(app):
 
         return fig
 
+    #the ranking map only depends on the radio option, build and compress each option once.
+    #The outputs with a value per park are only memoized, there are too many to keep their responses
+    figure_cache.cache_responses(app, 'map_ranking_park.figure')
+
     @app.callback(
         Output('demographic_bar', 'figure'),
         Input('select_service_by_park_demo', 'value')
         
     )
-    def generate_map_services(selected_park):
-        d_filter_name = df_inegi_av_demo[df_inegi_av['NOMBRE_PARQUE'] == selected_park]
-        d_filter_name = d_filter_name.groupby('NOMBRE_PARQUE').sum()
-
-        inegi_fem = d_filter_name[['P_0A2_F', 'P_3A5_F','P_6A11_F', 'P_12A14_F', 'P_15A17_F', 'P_18A24_F',  'P_60YMAS_F','POBFEM']]
-        inegi_fem['P_25A59_F'] = inegi_fem['POBFEM'] - (inegi_fem["P_0A2_F"] + inegi_fem["P_3A5_F"] + inegi_fem["P_6A11_F"] + inegi_fem["P_12A14_F"] + inegi_fem["P_15A17_F"] + inegi_fem["P_18A24_F"] + inegi_fem["P_60YMAS_F"])
-
-        inegi_Mas = d_filter_name[['P_0A2_M', 'P_3A5_M','P_6A11_M', 'P_12A14_M', 'P_15A17_M', 'P_18A24_M',  'P_60YMAS_M','POBMAS']]
-        inegi_Mas['P_25A59_M'] = inegi_Mas['POBMAS'] - (inegi_Mas["P_0A2_M"] + inegi_Mas["P_3A5_M"] + inegi_Mas["P_6A11_M"] + inegi_Mas["P_12A14_M"] + inegi_Mas["P_15A17_M"] + inegi_Mas["P_18A24_M"] + inegi_Mas["P_60YMAS_M"])
-
+    @memo.memoize()
+    def generate_demographic_bar(selected_park):
         #prepare data
-        women_bins = np.array(list(inegi_fem[['P_0A2_F', 'P_3A5_F','P_6A11_F', 'P_12A14_F', 'P_15A17_F', 'P_18A24_F', 'P_25A59_F', 'P_60YMAS_F']].sum() * -1))
-        men_bins = np.array(list(inegi_Mas[['P_0A2_M', 'P_3A5_M','P_6A11_M', 'P_12A14_M', 'P_15A17_M', 'P_18A24_M', 'P_25A59_M', 'P_60YMAS_M']].sum()))
+        inegi_fem, inegi_mas = age_pyramid([selected_park])
+        women_bins = inegi_fem * -1
+        men_bins = inegi_mas
         y = ['0 a 2 años', '3 a 5 años', '6 a 11 años', '12 a 14 años', '15 a 17 años', '18 a 24 años', '25 a 59 años', '60+ años']
 
         layout = go.Layout(yaxis=go.layout.YAxis(title='Rangos de edades'),
@@ -311,31 +465,52 @@ def assign_callbacks(app):
 
         return fig
 
+    #the sunburst is sent with the tipologias and parks, the activities of a node are
+    #requested when it is clicked and added to the figure in the browser
     @app.callback(
-        Output('sunburst_services', 'figure'),
+        Output('sunburst_services_base', 'data'),
         [Input('sunburst_services_top', 'value'),Input('sunburst_services_type', 'value')]
     )
-    def generate_map_services(top, isTop):
-        top = int(top)
-        df1 = df_av_denue_rank
-        if isTop:
-            df2 = df1[df1["NOMBRE_PARQUE"].isin(df1.sort_values('cantidad de servicios', ascending=False)['NOMBRE_PARQUE'].unique()[:top])]
-        else:
-            size_parks = len(df1.sort_values('cantidad de servicios', ascending=False)['NOMBRE_PARQUE'].unique())
-            df2 = df1[df1["NOMBRE_PARQUE"].isin(df1.sort_values('cantidad de servicios', ascending=False)['NOMBRE_PARQUE'].unique()[(size_parks - top):])]
-        
-        fig = px.sunburst(
-            df2, 
-            path=['TIPOLOGIA','NOMBRE_PARQUE', 'nombre_act'], 
-            color=df2['NOMBRE_PARQUE'],
-            hover_name=df2['NOMBRE_PARQUE'],
-            hover_data={'NOMBRE_PARQUE':False},
-            custom_data=['cantidad de servicios'],
-            color_discrete_sequence=['#590E0E', '#8C1616', '#CC730E', '#D6900F', '#FFC71F', '#FFE359', '#E4F279',  "#BDB655", "#9CA653", "#6C7339"],
+    @memo.memoize()
+    def generate_sunburst_services(top, isTop):
+        nodes = services_sunburst_nodes(int(top), isTop)
+
+        fig = go.Figure(go.Sunburst(
+            ids=nodes['ids'],
+            parents=nodes['parents'],
+            labels=nodes['labels'],
+            values=nodes['values'],
+            branchvalues='total',
+            marker_colors=nodes['colors'],
+            name='',
             maxdepth=2
-            )
+            ))
 
-        fig.update_layout(margin = dict(t=0, l=0, r=0, b=0), height=600)
+        #the selection keeps the node the user opened when the activities are added
+        fig.update_layout(margin = dict(t=0, l=0, r=0, b=0), height=600, meta={'selection': [top, isTop]}, uirevision=json.dumps([top, isTop]))
         fig.update_traces(insidetextorientation="auto", hovertemplate='%{label} <br> %{parent} <br> Servicios totales: %{value}')
 
         return fig
+
+    @app.callback(
+        Output('sunburst_services_children', 'data'),
+        Input('sunburst_services', 'clickData'),
+        [State('sunburst_services_top', 'value'),State('sunburst_services_type', 'value')]
+    )
+    def generate_sunburst_children(clickData, top, isTop):
+        if not clickData or 'id' not in clickData['points'][0]:
+            raise PreventUpdate
+        return generate_sunburst_children_of.encoded(clickData['points'][0]['id'], top, isTop)
+
+    @memo.memoize()
+    def generate_sunburst_children_of(node_id, top, isTop):
+        children = services_sunburst_children(node_id, int(top), isTop)
+        children['selection'] = [top, isTop]
+        return children
+
+    app.clientside_callback(
+        ClientsideFunction(namespace='implang', function_name='update_services_sunburst'),
+        Output('sunburst_services', 'figure'),
+        [Input('sunburst_services_base', 'data'), Input('sunburst_services_children', 'data')],
+        State('sunburst_services', 'figure')
+    )
@@ -0,0 +1,96 @@
+import gzip
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import flask
+
+try:
+    import brotli
+except ImportError: # without brotli the responses are only compressed with gzip
+    brotli = None
+
+# Compression of the callback responses by Accept-Encoding: brotli when the browser takes
+# it, gzip otherwise. Dash turns Flask-Compress on with gzip only, at the same level for
+# every response; the callback responses are compressed here instead (Flask-Compress skips
+# responses that already have a Content-Encoding). Most responses are built for a single
+# request and get a fast level. The responses of apps.figure_cache only depend on their
+# inputs, so their compressed bodies are kept with them: at the fast level for the first
+# request, while a background thread compresses them again at the best level for the next ones.
+CALLBACK_URL = "/_dash-update-component"
+MIN_SIZE = 500 # smaller responses are sent as they are, like Flask-Compress does
+FAST_LEVELS = {"br": 4, "gzip": 6}
+BEST_LEVELS = {"br": 11, "gzip": 9}
+ENCODINGS = ["br", "gzip"] if brotli is not None else ["gzip"]
+
+# the kept encodings are shared by the requests of every thread and the best level thread
+_lock = threading.Lock()
+_best_level = ThreadPoolExecutor(max_workers=1, thread_name_prefix="compression")
+
+
+def choose_encoding(accept_encodings):
+    '''
+    Returns the preferred encoding the request accepts, None for none
+    '''
+    for encoding in ENCODINGS:
+        if encoding in accept_encodings:
+            return encoding
+    return None
+
+def compress(body, encoding, best=False):
+    level = (BEST_LEVELS if best else FAST_LEVELS)[encoding]
+    if encoding == "br":
+        return brotli.compress(body, quality=level)
+    return gzip.compress(body, compresslevel=level)
+
+def keep(encodings):
+    '''
+    Takes the compressed body of the current response from encodings, a dict by encoding
+    kept with a cached response, and adds it there
+    '''
+    if flask.has_request_context():
+        flask.g.response_encodings = encodings
+
+def _compress_best(encodings, body, encoding):
+    compressed = compress(body, encoding, best=True)
+    with _lock:
+        encodings[encoding] = compressed
+
+def _kept(encodings, body, encoding):
+    '''
+    Returns the compressed body kept in encodings. The first time it is compressed at the fast
+    level and the best level is left to the background thread.
+    '''
+    with _lock:
+        compressed = encodings.get(encoding)
+    if compressed is not None:
+        return compressed
+    compressed = compress(body, encoding)
+    with _lock:
+        if encoding in encodings: # compressed by another request meanwhile
+            return encodings[encoding]
+        encodings[encoding] = compressed
+    _best_level.submit(_compress_best, encodings, body, encoding)
+    return compressed
+
+
+def init_app(server):
+    '''
+    Compresses the responses of the callbacks of the flask server
+    '''
+    @server.after_request
+    def compress_callback(response):
+        if flask.request.path != CALLBACK_URL or response.status_code != 200 or response.direct_passthrough or "Content-Encoding" in response.headers:
+            return response
+        response.vary.add("Accept-Encoding")
+        encoding = choose_encoding(flask.request.accept_encodings)
+        body = response.get_data()
+        if encoding is None or len(body) < MIN_SIZE:
+            return response
+
+        encodings = flask.g.get("response_encodings")
+        if encodings is None:
+            compressed = compress(body, encoding)
+        else:
+            compressed = _kept(encodings, body, encoding)
+        response.set_data(compressed)
+        response.headers["Content-Encoding"] = encoding
+        return response
@@ -0,0 +1,339 @@
+import os
+import json
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+from apps import geometry
+
+try:
+    import pyarrow as pa
+    from pyarrow import feather
+except ImportError: # the cache is optional, without pyarrow the csv files are parsed on every boot
+    pa = feather = None
+
+logger = logging.getLogger(__name__)
+
+# Single owner of every dataset in src_files. Each file is read exactly once per
+# process and the same objects are handed to the page modules and the callbacks.
+SRC_FILES = os.getenv("SRC_FILES", "src_files")
+
+# Typed and cleaned copies of the csv files are kept as uncompressed feather (Arrow IPC)
+# files so a cold start is a memory-mapped read instead of parsing text.
+# Bump CACHE_VERSION whenever a cleaner changes so old caches get rebuilt.
+CACHE_DIR = os.getenv("SRC_FILES_CACHE", os.path.join(SRC_FILES, ".cache"))
+CACHE_VERSION = 2
+
+# With DATA_STORE=arrow the tables are the memory-mapped cache files themselves: every
+# process of the host (gunicorn workers, process pools) maps the same pages read-only and
+# nothing is parsed. The frames are built over those buffers, numeric columns without
+# missing values are not copied; string columns still become Python objects in every
+# process. Point SRC_FILES_CACHE to /dev/shm to keep them in RAM.
+DATA_STORE = os.getenv("DATA_STORE", "pandas")
+
+## geojsons and helper json files
+JSON_FILES = {
+    "sector_k1": "sector_k1.geojson",
+    "av_k1": "av_k1.geojson",
+    "inegi_k1": "inegi_k1.geojson",
+    "park_names_features": "park_names_features.json",
+}
+
+# polygon layers with simplified copies for every level of detail in geometry.LEVELS_OF_DETAIL
+SIMPLIFIED_JSON = ["av_k1", "inegi_k1"]
+
+## csv
+CSV_FILES = {
+    "denue_ranking": "denue_ranking.csv", #union of green areas and denue with ranking
+    "completo_denue_av": "completo_denue_av.csv", #denue with green areas data
+    "av_k1": "av_k1.csv", #green areas
+    "denue_corregido": "denue_corregido.csv", #denue
+    "inegi_av_98": "inegi_av_98.csv", #union of green areas and inegi
+}
+
+# inegi columns that use "*" for confidential values and must be integers
+INEGI_INT_COLUMNS = [
+    'POBTOT', 'POBFEM', 'POBMAS',
+    'P_0A2', 'P_3A5', 'P_6A11', 'P_8A14', 'P_15A17', 'P_18A24', 'P_60YMAS',
+    'P_0A2_F', 'P_3A5_F', 'P_6A11_F', 'P_12A14_F', 'P_15A17_F', 'P_18A24_F', 'P_60YMAS_F',
+    'P_0A2_M', 'P_3A5_M', 'P_6A11_M', 'P_12A14_M', 'P_15A17_M', 'P_18A24_M', 'P_60YMAS_M',
+]
+
+# reentrant, a simplified level is built from the level 0 file under the same lock
+_lock = threading.RLock()
+_json = {}
+_frames = {}
+_tables = {}
+_simplified = {}
+_file_hashes = {}
+
+
+def _clean_inegi(df):
+    '''
+    Replaces missing and confidential ("*") values of the numeric columns by 0 and casts the
+    population columns to int. Text columns (park names...) keep their missing values.
+    '''
+    df = df.replace("*", 0)
+    # columns that had a "*" are left as a mix of str and int, make them numeric again
+    for col in df.columns[df.dtypes == object]:
+        try:
+            df[col] = pd.to_numeric(df[col])
+        except (ValueError, TypeError):
+            pass
+    numeric = df.columns[[pd.api.types.is_numeric_dtype(dtype) for dtype in df.dtypes]]
+    df[numeric] = df[numeric].fillna(0)
+    for col in INEGI_INT_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype(int)
+    return df
+
+CLEANERS = {
+    "inegi_av_98": _clean_inegi,
+}
+
+
+def _read_json(name):
+    with open(os.path.join(SRC_FILES, JSON_FILES[name])) as f:
+        return json.load(f)
+
+def _parse_csv(name):
+    df = pd.read_csv(os.path.join(SRC_FILES, CSV_FILES[name]))
+    if name in CLEANERS:
+        df = CLEANERS[name](df)
+    return df
+
+def _file_hash(path):
+    sha1 = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            sha1.update(chunk)
+    return sha1.hexdigest()
+
+def version(*files):
+    '''
+    Returns a short hash of the content of the given src_files files (all of them by default),
+    to key the artifacts built from the data.
+    '''
+    files = files or sorted(set(JSON_FILES.values()) | set(CSV_FILES.values()))
+    sha1 = hashlib.sha1(str(CACHE_VERSION).encode())
+    for filename in files:
+        if filename not in _file_hashes:
+            source_path = os.path.join(SRC_FILES, filename)
+            _file_hashes[filename] = _source_hash(source_path, os.stat(source_path))
+        sha1.update(_file_hashes[filename].encode())
+    return sha1.hexdigest()[:12]
+
+def _cache_paths(key, extension):
+    return os.path.join(CACHE_DIR, key + extension), os.path.join(CACHE_DIR, key + ".meta.json")
+
+def _read_meta(meta_path):
+    try:
+        with open(meta_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _source_hash(source_path, source_stat):
+    '''
+    Returns the sha1 of a src_files file. It is kept in a sidecar next to the caches and only
+    computed again when the mtime or size of the file changed.
+    '''
+    _, meta_path = _cache_paths(os.path.basename(source_path), "")
+    meta = _read_meta(meta_path)
+    if meta is not None and meta.get("version") == CACHE_VERSION and meta.get("mtime_ns") == source_stat.st_mtime_ns and meta.get("size") == source_stat.st_size:
+        return meta["sha1"]
+    sha1 = _file_hash(source_path)
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        _write_meta(meta_path, source_stat, sha1)
+    except OSError:
+        pass
+    return sha1
+
+def _cache_is_valid(source_path, source_stat, meta_path):
+    '''
+    The cache is valid when it was built from the same source file with the same cleaners.
+    The hash is only computed when the mtime or size changed (e.g. a fresh download of the same file).
+    '''
+    meta = _read_meta(meta_path)
+    if meta is None or meta.get("version") != CACHE_VERSION:
+        return False
+    if meta.get("mtime_ns") == source_stat.st_mtime_ns and meta.get("size") == source_stat.st_size:
+        return True
+    if meta.get("sha1") != _source_hash(source_path, source_stat):
+        return False
+    _write_meta(meta_path, source_stat, meta["sha1"])
+    return True
+
+def _write_meta(meta_path, source_stat, sha1):
+    tmp_path = meta_path + ".%d.tmp" % os.getpid()
+    with open(tmp_path, "w") as f:
+        json.dump({"version": CACHE_VERSION, "mtime_ns": source_stat.st_mtime_ns, "size": source_stat.st_size, "sha1": sha1}, f)
+    os.replace(tmp_path, meta_path)
+
+def _write_cache(key, extension, write, source_path, source_stat):
+    '''
+    Writes a cache file with write(path) and its sidecar, atomically so concurrent workers can build it
+    '''
+    cache_path, meta_path = _cache_paths(key, extension)
+    tmp_path = cache_path + ".%d.tmp" % os.getpid()
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        write(tmp_path)
+        os.replace(tmp_path, cache_path)
+        _write_meta(meta_path, source_stat, _source_hash(source_path, source_stat))
+    except Exception:
+        logger.warning("could not write the cache of %s, it will be built again on next boot", key, exc_info=True)
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def _read_csv(name):
+    '''
+    Reads a cleaned csv from its feather cache, (re)building the cache when the source changed.
+    '''
+    if feather is None:
+        return _parse_csv(name)
+
+    source_path = os.path.join(SRC_FILES, CSV_FILES[name])
+    source_stat = os.stat(source_path)
+    cache_path, meta_path = _cache_paths(name, ".feather")
+    if not (os.path.exists(cache_path) and _cache_is_valid(source_path, source_stat, meta_path)):
+        df = _parse_csv(name)
+        _write_cache(name, ".feather", lambda path: feather.write_feather(df, path, compression="uncompressed"), source_path, source_stat)
+        if DATA_STORE != "arrow" or not os.path.exists(cache_path):
+            return df
+
+    if DATA_STORE == "arrow":
+        return _map_table(name, cache_path).to_pandas(split_blocks=True)
+    return feather.read_feather(cache_path, memory_map=True)
+
+def _map_table(name, cache_path):
+    '''
+    Maps the Arrow IPC cache file of a table without reading it, the buffers of the table are the file pages
+    '''
+    if name not in _tables:
+        with pa.memory_map(cache_path) as source:
+            _tables.setdefault(name, pa.ipc.open_file(source).read_all())
+    return _tables[name]
+
+def _read_simplified(name, level):
+    '''
+    Reads the simplified geojson of a level of detail from the cache, building it when the source
+    or the tolerance and decimals of the level changed.
+    '''
+    tolerance, decimals = geometry.LEVELS_OF_DETAIL[level]
+    key = "%s.lod%d.%g-%d" % (name, level, tolerance, decimals)
+    source_path = os.path.join(SRC_FILES, JSON_FILES[name])
+    source_stat = os.stat(source_path)
+    cache_path, meta_path = _cache_paths(key, ".geojson")
+    if os.path.exists(cache_path) and _cache_is_valid(source_path, source_stat, meta_path):
+        with open(cache_path) as f:
+            return json.load(f)
+
+    simplified = geometry.simplify_geojson(geojson(name), tolerance, decimals)
+
+    def write(path):
+        with open(path, "w") as f:
+            json.dump(simplified, f, separators=(",", ":"))
+    _write_cache(key, ".geojson", write, source_path, source_stat)
+    return simplified
+
+
+def load():
+    '''
+    Loads every src_files dataset once, reading the files in parallel.
+    Calling it again is a no-op.
+    '''
+    # the json files can be released afterwards, the frames tell whether it ran
+    if _frames:
+        return
+    with _lock:
+        if _frames:
+            return
+        if pa is not None:
+            # pyarrow sets up its pandas support on first use, which is not thread safe
+            pa.Table.from_pandas(pd.DataFrame({"a": [0]}))
+        with ThreadPoolExecutor(max_workers=len(JSON_FILES) + len(CSV_FILES)) as pool:
+            json_jobs = {name: pool.submit(_read_json, name) for name in JSON_FILES}
+            csv_jobs = {name: pool.submit(_read_csv, name) for name in CSV_FILES}
+            loaded_json = {name: job.result() for name, job in json_jobs.items()}
+            loaded_frames = {name: job.result() for name, job in csv_jobs.items()}
+        for df in loaded_frames.values():
+            _read_only(df)
+        _frames.update(loaded_frames)
+        _json.update(loaded_json)
+
+
+def geojson(name, level=0):
+    '''
+    Returns the shared parsed json file. It is shared by every module, do not modify it.
+    A level of detail other than 0 returns the simplified version of a polygon layer.
+    '''
+    load()
+    if level == 0:
+        if name not in _json:
+            with _lock:
+                if name not in _json:
+                    _json[name] = _read_json(name)
+        return _json[name]
+    if (name, level) not in _simplified:
+        with _lock:
+            if (name, level) not in _simplified:
+                _simplified[(name, level)] = _read_simplified(name, level)
+    return _simplified[(name, level)]
+
+def release_json():
+    '''
+    Drops the parsed json files and simplified polygons once what is built from them is kept
+    (the encoded layers and the tile indexes), so they are not Python objects in every worker.
+    geojson() reads a file again if it is needed later.
+    '''
+    with _lock:
+        _json.clear()
+        _simplified.clear()
+
+def _read_only(df):
+    '''
+    Makes the numeric arrays of a shared dataframe read-only like the mapped ones of
+    DATA_STORE=arrow, writing to them in place raises instead of changing the data of every
+    other user. pandas can't compare read-only object arrays, the text columns stay writeable.
+    '''
+    for block in df._mgr.blocks:
+        if isinstance(block.values, np.ndarray) and block.values.dtype != object:
+            block.values.flags.writeable = False
+
+def frame(name):
+    '''
+    Returns a view of a shared dataframe. Adding, renaming or dropping columns on the view
+    does not affect the other users of the dataset. Writing numeric values in place raises
+    ValueError; text columns are not protected, never write to them in place.
+    '''
+    load()
+    return _frames[name].copy(deep=False)
+
+def partition(df, column):
+    '''
+    Groups the rows of df by column once and returns {value: positions}, the positions of
+    its rows in df for df.iloc. Only the index arrays are built, df is not copied, so the
+    frames over the mapped tables (DATA_STORE=arrow) stay shared. Positions keep the order
+    of the rows, a lookup costs the rows of that value instead of a scan over the whole frame.
+    Rows without a value (NaN) are left out.
+    '''
+    # the values are replaced by integer codes, object columns can mix str, int and NaN
+    codes, uniques = pd.factorize(df[column])
+    if len(codes) == 0:
+        return {}
+    order = np.argsort(codes, kind="mergesort")
+    codes = codes[order]
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    stops = np.r_[starts[1:], len(codes)]
+    return {uniques[codes[start]]: order[start:stop] for start, stop in zip(starts, stops) if codes[start] >= 0}
+
+if __name__ == '__main__':
+    # build the csv caches and the simplified polygons ahead of time, e.g. during a deploy
+    load()
+    for name in SIMPLIFIED_JSON:
+        for level in geometry.LEVELS_OF_DETAIL:
+            geojson(name, level)
@@ -0,0 +1,50 @@
+import os
+import json
+import threading
+from collections import OrderedDict
+from functools import wraps
+from apps import metrics, compression
+
+# Cache of serialized callback responses. A callback whose output only depends on a few
+# input values (e.g. a radio item) is run and serialized by Dash once per value, the next
+# requests get the same JSON bytes back without building or encoding the figure again.
+# The compressed bodies of every response are kept with it too (apps.compression).
+# FIGURE_CACHE=off leaves the callbacks as they are, for benchmarks.
+FIGURE_CACHE = os.getenv("FIGURE_CACHE", "on") != "off"
+
+
+def cache_responses(app, output, maxsize=32):
+    '''
+    Caches the serialized responses of the callback of output ("component_id.property").
+    Call it after the callback is registered. The inputs are the cache key, at most maxsize
+    responses are kept so unexpected input values can not grow the cache without limit.
+    '''
+    callback = app.callback_map[output]["callback"]
+    if not FIGURE_CACHE:
+        return callback
+    responses = OrderedDict()
+    lock = threading.Lock()
+
+    @wraps(callback)
+    def cached_callback(*args, **kwargs):
+        key = json.dumps(args, sort_keys=True)
+        with lock:
+            if key in responses:
+                responses.move_to_end(key)
+                metrics.cache_status(True)
+                compression.keep(responses[key]["encodings"])
+                return responses[key]["body"]
+        metrics.cache_status(False)
+        response = callback(*args, **kwargs)
+        if isinstance(response, str):
+            response = response.encode()
+        entry = {"body": response, "encodings": {}}
+        with lock:
+            responses[key] = entry
+            if len(responses) > maxsize:
+                responses.popitem(last=False)
+        compression.keep(entry["encodings"])
+        return response
+
+    app.callback_map[output]["callback"] = cached_callback
+    return cached_callback
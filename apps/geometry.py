@@ -0,0 +1,134 @@
+import math
+import numpy as np
+from shapely.geometry import shape, mapping
+from shapely.ops import unary_union
+
+# Geometry helpers computed once when the data is loaded so callbacks only do lookups.
+
+# services and inegi data are shown up to 400 mts around the green area
+SURROUNDINGS_M = 400
+METERS_PER_DEGREE = 111320
+
+# size in pixels of the park map and the zoom range used for it
+MAP_SIZE_PX = (600, 600)
+# size of the sector overview map
+OVERVIEW_SIZE_PX = (1100, 450)
+MIN_ZOOM = 12
+MAX_ZOOM = 15
+
+# simplification tolerance (degrees) and coordinate decimals of every level of detail,
+# level 0 is the full geometry. A level is used while its tolerance is below half a pixel.
+LEVELS_OF_DETAIL = {
+    1: (0.000005, 6), # ~0.5 mts
+    2: (0.00002, 5), # ~2 mts
+    3: (0.0001, 4), # ~10 mts
+}
+
+
+def mercator_y(lat):
+    return math.log(math.tan(math.pi / 4 + math.radians(lat) / 2))
+
+def fit_zoom(bounds, size_px=MAP_SIZE_PX, min_zoom=MIN_ZOOM, max_zoom=MAX_ZOOM):
+    '''
+    Returns the mapbox zoom that fits bounds (minx, miny, maxx, maxy) in a map of size_px
+    '''
+    minx, miny, maxx, maxy = bounds
+    width, height = size_px
+    zooms = [max_zoom]
+    if maxx > minx:
+        zooms.append(math.log2(width * 360 / ((maxx - minx) * 256)))
+    if maxy > miny:
+        zooms.append(math.log2(height * 2 * math.pi / ((mercator_y(maxy) - mercator_y(miny)) * 256)))
+    return max(min_zoom, min(zooms))
+
+def expand_bounds(bounds, meters):
+    '''
+    Expands bounds (minx, miny, maxx, maxy) in degrees by meters on every side
+    '''
+    minx, miny, maxx, maxy = bounds
+    dy = meters / METERS_PER_DEGREE
+    dx = meters / (METERS_PER_DEGREE * math.cos(math.radians((miny + maxy) / 2)))
+    return (minx - dx, miny - dy, maxx + dx, maxy + dy)
+
+def park_views(park_name_features):
+    '''
+    Builds {park name: {"center", "bounds", "zoom"}} for every park in park_names_features.
+    The center is the centroid of the first feature of the park, the bounds cover all of its
+    features and the zoom fits the park plus its surroundings in the park map.
+    '''
+    views = {}
+    for park, features in park_name_features.items():
+        shapes = [shape(feature['geometry']) for feature in features]
+        centroid = shapes[0].centroid
+        bounds = tuple(unary_union(shapes).bounds)
+        views[park] = {
+            'center': {'lon': centroid.x, 'lat': centroid.y},
+            'bounds': bounds,
+            'zoom': round(fit_zoom(expand_bounds(bounds, SURROUNDINGS_M)), 2),
+        }
+    return views
+
+
+def bounds_array(geojson):
+    '''
+    Returns a (features, 4) array with the bounds of every feature of a FeatureCollection
+    '''
+    bounds = [shape(feature['geometry']).bounds for feature in geojson['features']]
+    return np.array(bounds, dtype=float).reshape(-1, 4)
+
+def features_by_property(geojson, key):
+    '''
+    Returns {str(properties[key]): feature} to look features up by the values used as locations
+    '''
+    return {str(feature['properties'][key]): feature for feature in geojson['features']}
+
+def feature_collection(features):
+    return {'type': "FeatureCollection", 'features': list(features)}
+
+
+def level_for_zoom(zoom):
+    '''
+    Returns the coarsest level of detail that looks the same as the full geometry at zoom
+    '''
+    half_pixel = 360 / (256 * 2 ** zoom) / 2
+    levels = [level for level, (tolerance, _) in LEVELS_OF_DETAIL.items() if tolerance <= half_pixel]
+    return max(levels, default=0)
+
+def _quantize_ring(ring, decimals):
+    points = []
+    for point in ring:
+        point = [round(point[0], decimals), round(point[1], decimals)]
+        if not points or points[-1] != point:
+            points.append(point)
+    # a ring that collapses keeps its simplified coordinates
+    if len(points) < 4:
+        return [list(point[:2]) for point in ring]
+    return points
+
+def _quantize(geometry, decimals):
+    if geometry['type'] == 'Polygon':
+        coordinates = [_quantize_ring(ring, decimals) for ring in geometry['coordinates']]
+    elif geometry['type'] == 'MultiPolygon':
+        coordinates = [[_quantize_ring(ring, decimals) for ring in polygon] for polygon in geometry['coordinates']]
+    else:
+        return geometry
+    return {'type': geometry['type'], 'coordinates': coordinates}
+
+def simplify_geojson(geojson, tolerance, decimals):
+    '''
+    Returns a copy of a FeatureCollection with every polygon simplified with tolerance (in degrees,
+    without creating invalid polygons) and its coordinates rounded to decimals.
+    Features keep their order and properties.
+    '''
+    features = []
+    for feature in geojson['features']:
+        geom = shape(feature['geometry'])
+        simplified = geom.simplify(tolerance, preserve_topology=True)
+        if simplified.is_empty:
+            simplified = geom
+        features.append({
+            'type': "Feature",
+            'properties': feature['properties'],
+            'geometry': _quantize(mapping(simplified), decimals),
+        })
+    return feature_collection(features)
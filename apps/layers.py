@@ -0,0 +1,67 @@
+import json
+import hashlib
+import threading
+import flask
+from apps import compression
+
+# Polygon layers served as static files so the browser downloads each one once per deploy
+# instead of receiving the features inline in every figure. File names carry a hash of
+# the content, so they can be cached forever.
+URL_PREFIX = "/layers/"
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+_lock = threading.Lock()
+_layers = {}
+
+
+def register(name, geojson):
+    '''
+    Registers a geojson to be served as a static file and returns its url
+    '''
+    body = json.dumps(geojson, separators=(",", ":")).encode()
+    etag = hashlib.sha1(body).hexdigest()[:16]
+    filename = "%s.%s.geojson" % (name, etag)
+    with _lock:
+        if filename not in _layers:
+            _layers[filename] = {"body": body, "etag": etag, "encoded": {}}
+    return URL_PREFIX + filename
+
+def _encode(layer, encoding):
+    '''
+    Compresses a layer the first time it is requested with an encoding and keeps the result
+    '''
+    if encoding not in layer["encoded"]:
+        with _lock:
+            if encoding not in layer["encoded"]:
+                layer["encoded"][encoding] = compression.compress(layer["body"], encoding, best=True)
+    return layer["encoded"][encoding]
+
+def warm():
+    '''
+    Compresses every registered layer with every encoding, so a preloading master does it
+    once for all the workers
+    '''
+    for layer in list(_layers.values()):
+        for encoding in compression.ENCODINGS:
+            _encode(layer, encoding)
+
+
+def init_app(server):
+    '''
+    Adds the route that serves the registered layers to the flask server
+    '''
+    @server.route(URL_PREFIX + "<filename>")
+    def serve_layer(filename):
+        layer = _layers.get(filename)
+        if layer is None:
+            flask.abort(404)
+
+        encoding = compression.choose_encoding(flask.request.accept_encodings)
+        body = _encode(layer, encoding) if encoding else layer["body"]
+        response = flask.Response(body, mimetype="application/json")
+        if encoding:
+            response.headers["Content-Encoding"] = encoding
+        response.headers["Vary"] = "Accept-Encoding"
+        response.headers["Cache-Control"] = CACHE_CONTROL
+        response.set_etag(layer["etag"] + ("-" + encoding if encoding else ""))
+        return response.make_conditional(flask.request)
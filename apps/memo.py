@@ -0,0 +1,294 @@
+import os
+import re
+import json
+import time
+import shutil
+import hashlib
+import importlib
+import threading
+from collections import OrderedDict, defaultdict
+from functools import wraps
+import flask
+import plotly
+from apps import data, metrics, serializer
+
+# Memoization of the Dash callbacks. Every callback is a pure function of its inputs, so
+# its result is stored (as JSON) in a size-bounded LRU with an optional TTL. The default
+# backend is a directory shared by every gunicorn worker and kept across restarts; point
+# MEMO_DIR to /dev/shm to keep it in shared memory, set MEMO_BACKEND=memory for a
+# per-process cache or MEMO_BACKEND=off to run every call. Keys include the data version,
+# a hash of the source of the apps package and the versions of the libraries that build
+# the figures, so new data or a new deploy never gets old results. The directories of the
+# other versions are removed when the first cache is created if no process has used them
+# for MEMO_KEEP_DAYS, the old workers of a rolling deploy or another app on the same
+# MEMO_DIR keep theirs.
+MEMO_BACKEND = os.getenv("MEMO_BACKEND", "filesystem")
+MEMO_DIR = os.getenv("MEMO_DIR", os.path.join(data.CACHE_DIR, "memo"))
+MEMO_KEEP_DAYS = float(os.getenv("MEMO_KEEP_DAYS", 7))
+STATS_URL = "/memo-stats"
+# entries are {"expires": ..., "value": ...} written in this order, so the JSON of the value is
+# taken from a hit without decoding it
+ENTRY_PREFIX = '{"expires":'
+LIBRARIES = ["dash", "plotly", "pandas", "numpy"]
+# names of the version directories in MEMO_DIR, nothing else there is removed
+VERSION_PATTERN = re.compile(r"^[0-9a-f]{12}-[0-9a-f]{12}$")
+
+_names = set()
+_stats_lock = threading.Lock()
+_stats = defaultdict(lambda: {"hits": 0, "misses": 0, "evictions": 0, "expired": 0})
+
+
+def _count(name, counter, amount=1):
+    with _stats_lock:
+        _stats[name][counter] += amount
+
+def stats():
+    '''
+    Returns the hit, miss, eviction and expiration counters of every memoized function in this process
+    '''
+    with _stats_lock:
+        return {name: dict(counters) for name, counters in _stats.items()}
+
+
+class MemoryBackend:
+    '''
+    LRU kept in the memory of the process
+    '''
+    def __init__(self, name, maxsize, version):
+        self.name = name
+        self.maxsize = maxsize
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+
+    def get(self, key):
+        with self.lock:
+            if key not in self.entries:
+                return None
+            self.entries.move_to_end(key)
+            return self.entries[key]
+
+    def set(self, key, entry):
+        with self.lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+                _count(self.name, "evictions")
+
+    def delete(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+
+
+class FilesystemBackend:
+    '''
+    LRU shared by every process through a directory, one file per entry. The modification
+    time of a file is its last use, the oldest files are removed when there are more than maxsize.
+    '''
+    def __init__(self, name, maxsize, version):
+        self.name = name
+        self.maxsize = maxsize
+        self.directory = os.path.join(MEMO_DIR, version, name)
+        _remove_old_versions(version)
+        os.makedirs(self.directory, exist_ok=True)
+        # the version is in use, its directory is not removed by the processes of other versions
+        os.utime(os.path.join(MEMO_DIR, version))
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".json")
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                entry = f.read()
+            os.utime(path)
+        except OSError:
+            return None
+        return entry
+
+    def set(self, key, entry):
+        path = self._path(key)
+        tmp_path = "%s.%d.%d.tmp" % (path, os.getpid(), threading.get_ident())
+        try:
+            with open(tmp_path, "w") as f:
+                f.write(entry)
+            os.replace(tmp_path, path)
+        except OSError: # the directory of an old version removed by a new deploy
+            return
+        self._evict()
+
+    def delete(self, key):
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def _evict(self):
+        entries = []
+        for filename in os.listdir(self.directory):
+            if not filename.endswith(".json"):
+                continue
+            try:
+                entries.append((os.stat(os.path.join(self.directory, filename)).st_mtime_ns, filename))
+            except OSError:
+                pass
+        if len(entries) <= self.maxsize:
+            return
+        for _, filename in sorted(entries)[:len(entries) - self.maxsize]:
+            try:
+                os.remove(os.path.join(self.directory, filename))
+                _count(self.name, "evictions")
+            except OSError:
+                pass
+
+class NullBackend:
+    '''
+    Keeps nothing, every call runs the callback (MEMO_BACKEND=off, for benchmarks)
+    '''
+    def __init__(self, name, maxsize, version):
+        pass
+
+    def get(self, key):
+        return None
+
+    def set(self, key, entry):
+        pass
+
+    def delete(self, key):
+        pass
+
+BACKENDS = {
+    "memory": MemoryBackend,
+    "filesystem": FilesystemBackend,
+    "off": NullBackend,
+}
+
+
+def _code_version():
+    '''
+    Returns a short hash of the source of the apps package and of the versions of LIBRARIES
+    '''
+    sha1 = hashlib.sha1()
+    directory = os.path.dirname(os.path.abspath(__file__))
+    for filename in sorted(os.listdir(directory)):
+        if filename.endswith(".py"):
+            with open(os.path.join(directory, filename), "rb") as f:
+                sha1.update(filename.encode() + b"\0" + f.read())
+    for library in LIBRARIES:
+        sha1.update(("%s==%s;" % (library, importlib.import_module(library).__version__)).encode())
+    return sha1.hexdigest()[:12]
+
+_version = None
+_removed_versions = False
+
+def version():
+    '''
+    Returns the version of the cached results: the data version and the code version
+    '''
+    global _version
+    if _version is None:
+        _version = data.version() + "-" + _code_version()
+    return _version
+
+def _last_use(directory):
+    '''
+    Returns the last time a version directory was used: opened by a process or written to
+    '''
+    last_use = os.stat(directory).st_mtime
+    for entry in os.scandir(directory):
+        last_use = max(last_use, entry.stat().st_mtime)
+    return last_use
+
+def _remove_old_versions(current):
+    '''
+    Removes the directories of the other versions from MEMO_DIR that were not used in
+    MEMO_KEEP_DAYS, once per process
+    '''
+    global _removed_versions
+    if _removed_versions:
+        return
+    _removed_versions = True
+    try:
+        entries = os.listdir(MEMO_DIR)
+    except OSError:
+        return
+    oldest = time.time() - MEMO_KEEP_DAYS * 24 * 3600
+    for entry in entries:
+        if entry == current or not VERSION_PATTERN.match(entry):
+            continue
+        directory = os.path.join(MEMO_DIR, entry)
+        try:
+            if _last_use(directory) >= oldest:
+                continue
+        except OSError:
+            continue
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def memoize(maxsize=256, ttl=None, backend=None, name=None):
+    '''
+    Memoizes a callback by its arguments, keeping at most maxsize results for ttl seconds
+    (forever when ttl is None). The result must be JSON serializable (figures and dicts)
+    and is returned decoded from its JSON, a figure comes back as its dict.
+    name identifies the cache, by default the module and name of the function.
+    func.encoded(*args) returns the result as JSON for the responses (apps.serializer).
+    '''
+    def decorator(func):
+        cache_name = name or func.__module__ + "." + func.__qualname__.replace(".<locals>", "")
+        if cache_name in _names:
+            raise ValueError("%s is already memoized, give it another name" % cache_name)
+        _names.add(cache_name)
+        store = BACKENDS[backend or MEMO_BACKEND](cache_name, maxsize, version())
+
+        def lookup(args):
+            key = hashlib.sha1(json.dumps(args, sort_keys=True, cls=plotly.utils.PlotlyJSONEncoder).encode()).hexdigest()
+            entry = store.get(key)
+            if entry is not None and entry.startswith(ENTRY_PREFIX):
+                expires, value = entry[len(ENTRY_PREFIX):-1].split(',"value":', 1)
+                expires = json.loads(expires)
+                if expires is None or expires > time.time():
+                    _count(cache_name, "hits")
+                    metrics.cache_status(True)
+                    return key, value
+                store.delete(key)
+                _count(cache_name, "expired")
+            _count(cache_name, "misses")
+            metrics.cache_status(False)
+            return key, None
+
+        def store_value(key, value):
+            expires = time.time() + ttl if ttl is not None else None
+            encoded = serializer.dumps(value).decode()
+            store.set(key, ENTRY_PREFIX + json.dumps(expires) + ',"value":' + encoded + "}")
+            return encoded
+
+        @wraps(func)
+        def memoized(*args):
+            key, encoded = lookup(args)
+            if encoded is None:
+                encoded = store_value(key, func(*args))
+            # decoded on misses too, so the result is the same type whether it was cached or not
+            return json.loads(encoded)
+
+        def encoded(*args):
+            '''
+            Returns the result as a serializer.Fragment, hits are not decoded
+            '''
+            key, encoded = lookup(args)
+            if encoded is None:
+                encoded = store_value(key, func(*args))
+            return serializer.Fragment(encoded)
+
+        memoized.encoded = wraps(func)(encoded)
+        return memoized
+    return decorator
+
+
+def init_app(server):
+    '''
+    Adds a route with the counters of this worker to size the caches
+    '''
+    @server.route(STATS_URL)
+    def memo_stats():
+        return flask.jsonify({"pid": os.getpid(), "backend": MEMO_BACKEND, "stats": stats()})
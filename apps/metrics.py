@@ -0,0 +1,250 @@
+import os
+import json
+import time
+import bisect
+import threading
+from functools import wraps
+import flask
+from apps import data
+
+# Metrics of the Dash callbacks in the Prometheus text format, served at METRICS_URL.
+# For every callback output: the time of the callback itself, the time Dash takes to
+# serialize its result, the bytes of the response before and after compression, and the
+# requests by cache status (memo or figure_cache hit, miss, or none for callbacks without
+# a cache). Every gunicorn worker writes its numbers to METRICS_DIR at most every
+# FLUSH_SECONDS and a scrape adds up the ones of the running workers. The files are named
+# by pid and process start time, so the file of a worker that exited is removed instead of
+# being added to the numbers of a new process that got the same pid.
+METRICS_URL = "/metrics"
+METRICS_DIR = os.getenv("METRICS_DIR", os.path.join(data.CACHE_DIR, "metrics"))
+FLUSH_SECONDS = 1
+CALLBACK_URL = "/_dash-update-component"
+
+SECONDS_BUCKETS = [0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10]
+BYTES_BUCKETS = [2 ** power for power in range(8, 25, 2)] # 256 B to 16 MB
+
+HISTOGRAMS = {
+    "dash_callback_compute_seconds": ("Time spent in the callback function", SECONDS_BUCKETS),
+    "dash_callback_serialize_seconds": ("Time spent by Dash around the callback, mostly serializing its result", SECONDS_BUCKETS),
+    "dash_callback_response_bytes": ("Size of the callback response, before (identity) and after compression", BYTES_BUCKETS),
+}
+COUNTERS = {
+    "dash_callback_requests_total": "Callback requests by cache status and http status",
+}
+
+_lock = threading.Lock()
+_histograms = {name: {} for name in HISTOGRAMS}
+_counters = {name: {} for name in COUNTERS}
+_last_flush = 0
+_pending_flush = None
+
+
+def observe(name, value, **labels):
+    key = tuple(sorted(labels.items()))
+    with _lock:
+        if key not in _histograms[name]:
+            _histograms[name][key] = {"buckets": [0] * len(HISTOGRAMS[name][1]), "sum": 0, "count": 0}
+        histogram = _histograms[name][key]
+        index = bisect.bisect_left(HISTOGRAMS[name][1], value)
+        if index < len(histogram["buckets"]):
+            histogram["buckets"][index] += 1
+        histogram["sum"] += value
+        histogram["count"] += 1
+
+def increment(name, **labels):
+    key = tuple(sorted(labels.items()))
+    with _lock:
+        _counters[name][key] = _counters[name].get(key, 0) + 1
+
+def cache_status(hit):
+    '''
+    Records whether the cache of the current callback had its result, called by the caches
+    '''
+    if flask.has_request_context() and "callback_metrics" in flask.g:
+        flask.g.callback_metrics["cache"] = "hit" if hit else "miss"
+
+
+def _snapshot():
+    with _lock:
+        return {
+            "histograms": {name: [[dict(key), dict(value, buckets=list(value["buckets"]))] for key, value in values.items()] for name, values in _histograms.items()},
+            "counters": {name: [[dict(key), value] for key, value in values.items()] for name, values in _counters.items()},
+        }
+
+def _flush(force=False):
+    '''
+    Writes the metrics of this process to METRICS_DIR for the scrapes answered by other workers
+    '''
+    global _last_flush, _pending_flush
+    now = time.time()
+    if not force and now - _last_flush < FLUSH_SECONDS:
+        # the last requests of a burst are written a bit later
+        with _lock:
+            if _pending_flush is None:
+                _pending_flush = threading.Timer(FLUSH_SECONDS, _flush, kwargs={"force": True})
+                _pending_flush.daemon = True
+                _pending_flush.start()
+        return
+    _last_flush = now
+    with _lock:
+        _pending_flush = None
+    try:
+        os.makedirs(METRICS_DIR, exist_ok=True)
+        path = os.path.join(METRICS_DIR, "%d-%d.json" % (os.getpid(), _start_time(os.getpid())))
+        with open(path + ".tmp", "w") as f:
+            json.dump(_snapshot(), f)
+        os.replace(path + ".tmp", path)
+    except OSError:
+        pass
+
+def _start_time(pid):
+    '''
+    Returns the start time of the process in clock ticks since boot, None if it is not running.
+    Without /proc (not linux) it is 0 for every running process.
+    '''
+    try:
+        with open("/proc/%d/stat" % pid) as f:
+            # the fields after the command, which can have spaces, start with the state
+            return int(f.read().rsplit(")", 1)[1].split()[19])
+    except FileNotFoundError:
+        if os.path.isdir("/proc/self"):
+            return None
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return None
+    except PermissionError:
+        pass
+    return 0
+
+def _collect():
+    '''
+    Adds up the metrics of every running process
+    '''
+    _flush(force=True)
+    histograms = {name: {} for name in HISTOGRAMS}
+    counters = {name: {} for name in COUNTERS}
+    for filename in os.listdir(METRICS_DIR):
+        if not filename.endswith(".json"):
+            continue
+        try:
+            pid, start = [int(part) for part in filename[:-len(".json")].split("-")]
+        except ValueError:
+            pid, start = None, None
+        if pid is None or _start_time(pid) != start:
+            # a worker that exited, the process that had its pid before, or an older file name
+            try:
+                os.remove(os.path.join(METRICS_DIR, filename))
+            except OSError:
+                pass
+            continue
+        try:
+            with open(os.path.join(METRICS_DIR, filename)) as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            continue
+        for name, values in snapshot["histograms"].items():
+            for labels, value in values:
+                key = tuple(sorted(labels.items()))
+                total = histograms[name].setdefault(key, {"buckets": [0] * len(value["buckets"]), "sum": 0, "count": 0})
+                total["buckets"] = [a + b for a, b in zip(total["buckets"], value["buckets"])]
+                total["sum"] += value["sum"]
+                total["count"] += value["count"]
+        for name, values in snapshot["counters"].items():
+            for labels, value in values:
+                key = tuple(sorted(labels.items()))
+                counters[name][key] = counters[name].get(key, 0) + value
+    return histograms, counters
+
+def _labels(key, **extra):
+    labels = list(key) + sorted(extra.items())
+    return "{%s}" % ",".join('%s="%s"' % (name, str(value).replace("\\", "\\\\").replace('"', '\\"')) for name, value in labels)
+
+def render():
+    '''
+    Returns the metrics of every running process in the Prometheus text format
+    '''
+    histograms, counters = _collect()
+    lines = []
+    for name, (description, buckets) in HISTOGRAMS.items():
+        lines += ["# HELP %s %s" % (name, description), "# TYPE %s histogram" % name]
+        for key, value in sorted(histograms[name].items()):
+            cumulative = 0
+            for bound, count in zip(buckets, value["buckets"]):
+                cumulative += count
+                lines.append("%s_bucket%s %d" % (name, _labels(key, le=bound), cumulative))
+            lines.append("%s_bucket%s %d" % (name, _labels(key, le="+Inf"), value["count"]))
+            lines.append("%s_sum%s %r" % (name, _labels(key), float(value["sum"])))
+            lines.append("%s_count%s %d" % (name, _labels(key), value["count"]))
+    for name, description in COUNTERS.items():
+        lines += ["# HELP %s %s" % (name, description), "# TYPE %s counter" % name]
+        for key, value in sorted(counters[name].items()):
+            lines.append("%s%s %d" % (name, _labels(key), value))
+    return "\n".join(lines) + "\n"
+
+
+def _timed(func):
+    '''
+    Adds the time of a callback function to the metrics of the current request
+    '''
+    @wraps(func)
+    def timed(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            if flask.has_request_context() and "callback_metrics" in flask.g:
+                flask.g.callback_metrics["compute"] += time.perf_counter() - start
+    return timed
+
+def init_app(app):
+    '''
+    Instruments every callback registered after it is called and adds the metrics route.
+    It takes the Dash app, call it before registering the callbacks.
+    '''
+    server = app.server
+    register = app.callback
+
+    def callback(*args, **kwargs):
+        decorator = register(*args, **kwargs)
+        return lambda func: decorator(_timed(func))
+    app.callback = callback
+
+    dispatch = server.view_functions[CALLBACK_URL]
+
+    @wraps(dispatch)
+    def timed_dispatch(*args, **kwargs):
+        flask.g.callback_metrics = {"compute": 0, "cache": "none"}
+        start = time.perf_counter()
+        response = dispatch(*args, **kwargs)
+        flask.g.callback_metrics["dispatch"] = time.perf_counter() - start
+        flask.g.callback_metrics["identity_bytes"] = len(response.get_data())
+        return response
+    server.view_functions[CALLBACK_URL] = timed_dispatch
+
+    # the after request functions run in reverse order, the first one runs after the compression
+    def record_response(response):
+        metrics = flask.g.get("callback_metrics")
+        if metrics is None or flask.request.path != CALLBACK_URL:
+            return response
+        output = (flask.request.get_json(silent=True) or {}).get("output")
+        # the body comes from the client, only the registered outputs become labels
+        if not isinstance(output, str) or output not in app.callback_map:
+            output = "unknown"
+        increment("dash_callback_requests_total", output=output, cache=metrics["cache"], status=response.status_code)
+        if "dispatch" in metrics:
+            observe("dash_callback_compute_seconds", metrics["compute"], output=output)
+            observe("dash_callback_serialize_seconds", max(0, metrics["dispatch"] - metrics["compute"]), output=output)
+            observe("dash_callback_response_bytes", metrics["identity_bytes"], output=output, encoding="identity")
+            encoding = response.headers.get("Content-Encoding")
+            if encoding and not response.direct_passthrough:
+                observe("dash_callback_response_bytes", len(response.get_data()), output=output, encoding=encoding)
+        _flush()
+        return response
+    server.after_request_funcs.setdefault(None, []).insert(0, record_response)
+
+    @server.route(METRICS_URL)
+    def metrics():
+        return flask.Response(render(), mimetype="text/plain; version=0.0.4")
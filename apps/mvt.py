@@ -0,0 +1,139 @@
+import struct
+
+# Minimal Mapbox Vector Tile (v2.1) encoder. Geometries come already in tile coordinates,
+# lists of [x, y] pairs with y going down, as produced by apps.tiles.
+
+EXTENT = 4096
+
+POINT = 1
+POLYGON = 3
+
+_MOVE_TO = 1
+_LINE_TO = 2
+_CLOSE_PATH = 7
+
+
+def _varint(value):
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+def _zigzag(value):
+    return (value << 1) ^ (value >> 63)
+
+def _key(field, wire_type):
+    return _varint((field << 3) | wire_type)
+
+def _bytes_field(field, payload):
+    return _key(field, 2) + _varint(len(payload)) + payload
+
+def _varint_field(field, value):
+    return _key(field, 0) + _varint(value)
+
+def _packed_field(field, values):
+    return _bytes_field(field, b"".join(_varint(value) for value in values))
+
+def _value(value):
+    if isinstance(value, bool):
+        return _varint_field(7, int(value))
+    if isinstance(value, int):
+        return _varint_field(6, _zigzag(value))
+    if isinstance(value, float):
+        return _key(3, 1) + struct.pack("<d", value)
+    return _bytes_field(1, str(value).encode())
+
+def _command(command, count):
+    return (command & 0x7) | (count << 3)
+
+
+def _ring_area(ring):
+    area = 0
+    for (x0, y0), (x1, y1) in zip(ring, ring[1:] + ring[:1]):
+        area += x0 * y1 - x1 * y0
+    return area
+
+def _clean_ring(ring):
+    '''
+    Drops repeated points and the closing point of a ring already rounded to integers
+    '''
+    points = []
+    for point in ring:
+        if not points or points[-1] != point:
+            points.append(point)
+    if len(points) > 1 and points[0] == points[-1]:
+        points.pop()
+    return points
+
+def _encode_points(points, cursor):
+    commands = [_command(_MOVE_TO, len(points))]
+    for x, y in points:
+        commands += [_zigzag(x - cursor[0]), _zigzag(y - cursor[1])]
+        cursor = (x, y)
+    return commands, cursor
+
+def _encode_polygons(polygons, cursor):
+    '''
+    polygons is a list of polygons, every polygon a list of rings where the first is the
+    exterior. Exterior rings are written with positive area and holes with negative area.
+    '''
+    commands = []
+    for polygon in polygons:
+        for i, ring in enumerate(polygon):
+            ring = _clean_ring(ring)
+            area = _ring_area(ring) if len(ring) >= 3 else 0
+            if area == 0:
+                if i == 0:
+                    break # a collapsed exterior drops the whole polygon
+                continue
+            if (area > 0) != (i == 0):
+                ring = ring[::-1]
+            (x, y), rest = ring[0], ring[1:]
+            commands += [_command(_MOVE_TO, 1), _zigzag(x - cursor[0]), _zigzag(y - cursor[1]), _command(_LINE_TO, len(rest))]
+            cursor = (x, y)
+            for x, y in rest:
+                commands += [_zigzag(x - cursor[0]), _zigzag(y - cursor[1])]
+                cursor = (x, y)
+            commands.append(_command(_CLOSE_PATH, 1))
+    return commands, cursor
+
+
+def encode_layer(name, features, extent=EXTENT):
+    '''
+    Encodes one layer. features is a list of dicts with "type" (POINT or POLYGON),
+    "geometry" (points, or a list of polygons made of rings) and "properties".
+    '''
+    keys, values = {}, {}
+    encoded_features = []
+    for feature in features:
+        if feature["type"] == POINT:
+            commands, _ = _encode_points(feature["geometry"], (0, 0))
+        else:
+            commands, _ = _encode_polygons(feature["geometry"], (0, 0))
+        if len(commands) <= 1:
+            continue
+        tags = []
+        for key, value in feature["properties"].items():
+            if value is None:
+                continue
+            tags.append(keys.setdefault(key, len(keys)))
+            tags.append(values.setdefault((type(value), value), len(values)))
+        payload = b""
+        if feature.get("id") is not None:
+            payload += _varint_field(1, feature["id"])
+        payload += _packed_field(2, tags) + _varint_field(3, feature["type"]) + _packed_field(4, commands)
+        encoded_features.append(_bytes_field(2, payload))
+
+    if not encoded_features:
+        return b""
+    layer = _varint_field(15, 2) + _bytes_field(1, name.encode())
+    layer += b"".join(encoded_features)
+    layer += b"".join(_bytes_field(3, key.encode()) for key in keys)
+    layer += b"".join(_bytes_field(4, _value(value)) for _, value in values)
+    layer += _varint_field(5, extent)
+    return _bytes_field(3, layer)
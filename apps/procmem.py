@@ -0,0 +1,61 @@
+import os
+import sys
+import json
+import flask
+
+# Memory used by the processes of the app. With gunicorn preloading the data (see
+# gunicorn.conf.py) the workers share the pages of the master, so what one more worker
+# costs is its unique memory (USS, the private pages), not its RSS. The counters of a
+# worker are served at STATS_URL, and
+#   python -m apps.procmem <gunicorn master pid>
+# prints the ones of the master and every worker.
+STATS_URL = "/memory-stats"
+
+
+def usage(pid="self"):
+    '''
+    Returns the rss, pss, uss (private pages) and shared memory in bytes of a process,
+    or None when /proc/<pid>/smaps_rollup can not be read (not Linux, older kernels)
+    '''
+    try:
+        with open("/proc/%s/smaps_rollup" % pid) as f:
+            lines = f.readlines()
+    except OSError:
+        return None
+    fields = {}
+    for line in lines[1:]:
+        name, value = line.split(":", 1)
+        fields[name] = int(value.split()[0]) * 1024
+    return {
+        "rss": fields.get("Rss", 0),
+        "pss": fields.get("Pss", 0),
+        "uss": fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0),
+        "shared": fields.get("Shared_Clean", 0) + fields.get("Shared_Dirty", 0),
+    }
+
+def children(pid):
+    '''
+    Returns the pids of the child processes of pid
+    '''
+    pids = []
+    for task in os.listdir("/proc/%s/task" % pid):
+        with open("/proc/%s/task/%s/children" % (pid, task)) as f:
+            pids += [int(child) for child in f.read().split()]
+    return pids
+
+
+def init_app(server):
+    '''
+    Adds a route with the memory of the worker that answers it
+    '''
+    @server.route(STATS_URL)
+    def memory_stats():
+        return flask.jsonify({"pid": os.getpid(), "memory": usage()})
+
+
+if __name__ == '__main__':
+    master = int(sys.argv[1]) if len(sys.argv) > 1 else os.getpid()
+    report = {"master": {"pid": master, "memory": usage(master)}, "workers": []}
+    for pid in children(master):
+        report["workers"].append({"pid": pid, "memory": usage(pid)})
+    print(json.dumps(report, indent=2))
@@ -0,0 +1,139 @@
+import os
+import json
+import uuid
+import logging
+import collections
+import dash
+import plotly
+from dash import _validate
+from dash.dependencies import handle_callback_args
+from dash._utils import stringify_id
+from dash.dash import _NoUpdate
+from dash.exceptions import PreventUpdate
+
+try:
+    import orjson
+except ImportError: # without orjson the responses are encoded by plotly's encoder
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Serializer of the Dash callback responses. Dash encodes every response with plotly's
+# JSONEncoder, which walks every list and dict in Python; orjson encodes the same values
+# in C and writes numpy arrays without converting them to lists first. Values that are
+# already JSON (the results of apps.memo) go in the response as Fragments, their bytes are
+# copied instead of decoded and encoded again. SERIALIZER=plotly uses plotly's encoder.
+# The callbacks are wrapped like Dash's own add_context, whose body is private to a Dash
+# version: other versions keep Dash's serializer.
+SERIALIZER = os.getenv("SERIALIZER", "orjson" if orjson is not None else "plotly")
+DASH_VERSION = "1.19."
+
+_ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS if orjson is not None else 0
+# placeholders of the fragments while encoding, the nonce keeps them from matching real strings
+_FRAGMENT_TOKEN = "__fragment_%s_%%d__" % uuid.uuid4().hex
+
+
+class Fragment:
+    '''
+    JSON bytes that go in a response as they are
+    '''
+    __slots__ = ["data"]
+
+    def __init__(self, data):
+        self.data = data if isinstance(data, bytes) else data.encode()
+
+
+class _PlotlyEncoder(plotly.utils.PlotlyJSONEncoder):
+    def __init__(self, *args, fragments=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fragments = fragments
+
+    def default(self, obj):
+        if isinstance(obj, Fragment):
+            return _placeholder(obj, self.fragments)
+        return super().default(obj)
+
+def _placeholder(value, fragments):
+    fragments.append(value)
+    return _FRAGMENT_TOKEN % (len(fragments) - 1)
+
+def _orjson_default(fragments):
+    encoder = plotly.utils.PlotlyJSONEncoder()
+    def default(obj):
+        if isinstance(obj, Fragment):
+            return _placeholder(obj, fragments)
+        # figures, components, pandas objects, arrays orjson can't write...
+        return encoder.default(obj)
+    return default
+
+def dumps(value):
+    '''
+    Returns the JSON bytes of value, raises TypeError when it is not serializable
+    '''
+    fragments = []
+    if SERIALIZER == "orjson":
+        body = orjson.dumps(value, default=_orjson_default(fragments), option=_ORJSON_OPTIONS)
+    else:
+        body = json.dumps(value, cls=_PlotlyEncoder, fragments=fragments).encode()
+    for i, value_fragment in enumerate(fragments):
+        body = body.replace(b'"%s"' % (_FRAGMENT_TOKEN % i).encode(), value_fragment.data, 1)
+    return body
+
+
+def _serialized(func, callback_id, output):
+    '''
+    Dash's callback wrapper (add_context in dash.py) encoding the response with dumps
+    '''
+    multi = isinstance(output, (list, tuple))
+
+    def serialized_callback(*args, **kwargs):
+        output_spec = kwargs.pop("outputs_list")
+        output_value = func(*args, **kwargs)
+        if isinstance(output_value, _NoUpdate):
+            raise PreventUpdate
+
+        if not multi:
+            output_value, output_spec = [output_value], [output_spec]
+        _validate.validate_multi_return(output_spec, output_value, callback_id)
+
+        component_ids = collections.defaultdict(dict)
+        has_update = False
+        for val, spec in zip(output_value, output_spec):
+            if isinstance(val, _NoUpdate):
+                continue
+            for vali, speci in zip(val, spec) if isinstance(spec, list) else [[val, spec]]:
+                if not isinstance(vali, _NoUpdate):
+                    has_update = True
+                    component_ids[stringify_id(speci["id"])][speci["property"]] = vali
+        if not has_update:
+            raise PreventUpdate
+
+        try:
+            return dumps({"response": component_ids, "multi": True})
+        except TypeError:
+            _validate.fail_callback_output(output_value, output)
+    return serialized_callback
+
+def init_app(app):
+    '''
+    Serializes with dumps the responses of every callback registered after it is called.
+    Memoized callbacks answer with the JSON kept by apps.memo. It takes the Dash app, call it
+    after metrics.init_app and before registering the callbacks.
+    '''
+    if not dash.__version__.startswith(DASH_VERSION):
+        logger.warning("apps.serializer supports dash %sx, not %s: the responses are encoded by dash", DASH_VERSION, dash.__version__)
+        return
+    register = app.callback
+
+    def callback(*args, **kwargs):
+        decorator = register(*args, **kwargs)
+        output, _, _, _ = handle_callback_args(args, kwargs)
+
+        def wrap(func):
+            add_context = decorator(getattr(func, "encoded", func))
+            for callback_id, entry in app.callback_map.items():
+                if entry.get("callback") is add_context:
+                    entry["callback"] = _serialized(add_context.__wrapped__, callback_id, output)
+            return add_context
+        return wrap
+    app.callback = callback
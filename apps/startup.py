@@ -0,0 +1,106 @@
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+import platform
+import subprocess
+
+# Startup report of the app, as json so it can be kept per release to catch regressions:
+#   python -m apps.startup [--cold] > startup.json
+# - imports: import time of every module that takes at least MIN_IMPORT_US when importing
+#   app.py in a fresh interpreter (python -X importtime), data loading included
+# - data: time to read every src_files file, from its cache when there is a valid one
+# - layout: time to import app in this process and to build the layout of the pages
+# --cold uses an empty cache directory, to measure a first boot.
+MIN_IMPORT_US = 1000
+
+
+def import_times(env):
+    '''
+    Imports app in a new interpreter and returns its wall time and the modules sorted by cumulative time
+    '''
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, universal_newlines=True, check=True
+    )
+    wall = time.perf_counter() - start
+
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if int(cumulative_us) >= MIN_IMPORT_US:
+            modules.append({"module": name.strip(), "self_us": int(self_us), "cumulative_us": int(cumulative_us)})
+    return wall, sorted(modules, key=lambda module: module["cumulative_us"], reverse=True)
+
+def data_times(data):
+    '''
+    Reads every src_files file on its own and returns the time it took
+    '''
+    times = {}
+    for name, filename in data.JSON_FILES.items():
+        start = time.perf_counter()
+        data._read_json(name)
+        times[filename] = {"seconds": time.perf_counter() - start}
+    for name, filename in data.CSV_FILES.items():
+        source_path = os.path.join(data.SRC_FILES, filename)
+        cache_path, meta_path = data._cache_paths(name, ".feather")
+        cached = data.feather is not None and os.path.exists(cache_path) and data._cache_is_valid(source_path, os.stat(source_path), meta_path)
+        start = time.perf_counter()
+        data._read_csv(name)
+        times[filename] = {"seconds": time.perf_counter() - start, "cached": cached}
+    for filename, report in times.items():
+        report["bytes"] = os.path.getsize(os.path.join(data.SRC_FILES, filename))
+    return times
+
+def layout_times():
+    '''
+    Imports the app and returns the time to import it and to build the layout of the pages
+    that are built on first use (the home page is static)
+    '''
+    start = time.perf_counter()
+    import app
+    from apps import itesm
+    times = {"import app": time.perf_counter() - start}
+
+    start = time.perf_counter()
+    itesm.serve_layout()
+    times["itesm.serve_layout"] = time.perf_counter() - start
+    return times
+
+
+def report(cold=False):
+    '''
+    Returns the startup report, cold uses empty cache directories for the new interpreter and for this one
+    '''
+    import_env = dict(os.environ)
+    cache_dir = None
+    if cold:
+        cache_dir = tempfile.mkdtemp(prefix="startup-")
+        for env, directory in [(import_env, "import"), (os.environ, "report")]:
+            env["SRC_FILES_CACHE"] = os.path.join(cache_dir, directory)
+            env["MEMO_DIR"] = os.path.join(cache_dir, directory, "memo")
+    try:
+        import_wall, imports = import_times(import_env)
+        from apps import data
+        result = {
+            "python": platform.python_version(),
+            "data_version": data.version(),
+            "cold": cold,
+            "import_app_seconds": import_wall,
+            "data": data_times(data),
+            "layout": layout_times(),
+            "imports": imports,
+        }
+    finally:
+        if cache_dir:
+            shutil.rmtree(cache_dir, ignore_errors=True)
+    return result
+
+
+if __name__ == '__main__':
+    print(json.dumps(report(cold="--cold" in sys.argv[1:]), indent=2))
@@ -0,0 +1,293 @@
+import os
+import sys
+import math
+import threading
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+import flask
+from shapely.geometry import box, Polygon, MultiPolygon
+from apps import data, geometry, mvt
+
+# Mapbox vector tiles of the polygon layers, so the maps can scale past sector K1
+# without sending whole FeatureCollections. Tiles are built from a grid index over the
+# features, kept in an LRU cache and can also be prebuilt on disk with
+#   python -m apps.tiles [max zoom]
+URL_PREFIX = "/tiles/"
+TILE_LAYERS = ["av_k1", "inegi_k1"]
+MAX_ZOOM = 22
+# lowest zoom of the prebuilt pyramid, lower zooms are cheap to render on demand
+PYRAMID_MIN_ZOOM = 10
+# tiles of these zooms are the cells of the spatial indexes, a tile uses the grid of the
+# highest of them up to its zoom; tiles below all of them cover the whole area of the data
+INDEX_ZOOMS = [10, 12, 14]
+# features are clipped a bit outside the tile so the borders do not show
+BUFFER = 64
+TILE_CACHE_SIZE = int(os.getenv("TILE_CACHE_SIZE", 4096))
+PYRAMID_DIR = os.path.join(data.CACHE_DIR, "tiles")
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# source files of every layer, used to version the tile urls
+LAYER_FILES = {
+    "av_k1": [data.JSON_FILES["av_k1"]],
+    "inegi_k1": [data.JSON_FILES["inegi_k1"]],
+}
+
+_lock = threading.Lock()
+_indexes = {}
+
+
+def tile_bounds(z, x, y):
+    '''
+    Returns the bounds (minx, miny, maxx, maxy) in degrees of a tile
+    '''
+    n = 2 ** z
+    minx = x / n * 360 - 180
+    maxx = (x + 1) / n * 360 - 180
+    maxy = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * y / n))))
+    miny = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * (y + 1) / n))))
+    return (minx, miny, maxx, maxy)
+
+def tile_range(bounds, z):
+    '''
+    Returns the x and y ranges of the tiles of zoom z that cover bounds
+    '''
+    minx, miny, maxx, maxy = bounds
+    n = 2 ** z
+    x0 = int((minx + 180) / 360 * n)
+    x1 = int((maxx + 180) / 360 * n)
+    y0 = int((1 - geometry.mercator_y(maxy) / math.pi) / 2 * n)
+    y1 = int((1 - geometry.mercator_y(miny) / math.pi) / 2 * n)
+    return range(max(x0, 0), min(x1, n - 1) + 1), range(max(y0, 0), min(y1, n - 1) + 1)
+
+def _to_tile(coords, z, x, y):
+    '''
+    Projects an (n, 2) array of lon, lat to integer coordinates inside tile z/x/y
+    '''
+    coords = np.asarray(coords, dtype=float)[:, :2]
+    n = 2 ** z
+    px = (coords[:, 0] + 180) / 360 * n
+    lat = np.radians(np.clip(coords[:, 1], -85.0511, 85.0511))
+    py = (1 - np.log(np.tan(lat) + 1 / np.cos(lat)) / math.pi) / 2 * n
+    return np.column_stack([np.round((px - x) * mvt.EXTENT), np.round((py - y) * mvt.EXTENT)]).astype(int).tolist()
+
+
+def _property_columns(columns):
+    '''
+    Keeps the properties of the features as arrays, {key: (codes, values)}: the values of
+    integer columns are the codes, the other columns index their distinct values (-1 for
+    a feature without the property)
+    '''
+    stored = {}
+    for key, column in columns.items():
+        column = pd.Series(column)
+        if pd.api.types.is_integer_dtype(column):
+            stored[key] = (column.to_numpy(dtype=np.int64), None)
+        else:
+            codes, values = pd.factorize(pd.Series(list(column), dtype=object))
+            stored[key] = (codes, list(values))
+    return stored
+
+def _properties(index, i):
+    properties = {}
+    for key, (codes, values) in index["properties"].items():
+        if values is None:
+            properties[key] = int(codes[i])
+        elif codes[i] >= 0:
+            properties[key] = values[codes[i]]
+    return properties
+
+def _geojson_polygons(geom):
+    if not geom:
+        return []
+    if geom["type"] == "Polygon":
+        return [geom["coordinates"]]
+    if geom["type"] == "MultiPolygon":
+        return geom["coordinates"]
+    return []
+
+def _polygon_index(name, level):
+    '''
+    Index of a polygon layer. The rings of every feature are kept in one coordinates array
+    with the offsets of the rings, polygons and features, and the properties as columns,
+    instead of a shapely object and a dict per feature
+    '''
+    layer = data.geojson(name, level)
+    coords, ring_offsets, polygon_offsets, feature_offsets = [], [0], [0], [0]
+    for feature in layer['features']:
+        for polygon in _geojson_polygons(feature['geometry']):
+            for ring in polygon:
+                coords.append(np.asarray(ring, dtype=float).reshape(len(ring), -1)[:, :2])
+                ring_offsets.append(ring_offsets[-1] + len(ring))
+            polygon_offsets.append(len(ring_offsets) - 1)
+        feature_offsets.append(len(polygon_offsets) - 1)
+    properties = [feature['properties'] or {} for feature in layer['features']]
+    return {
+        "type": mvt.POLYGON,
+        "coords": np.concatenate(coords) if coords else np.empty((0, 2)),
+        "ring_offsets": np.array(ring_offsets),
+        "polygon_offsets": np.array(polygon_offsets),
+        "feature_offsets": np.array(feature_offsets),
+        "properties": _property_columns({key: [props.get(key) for props in properties] for key in dict.fromkeys(key for props in properties for key in props)}),
+        # bounds of the full geometry, every level of detail keeps the order of the features
+        "bounds": geometry.bounds_array(data.geojson(name)),
+    }
+
+def _shape(index, i):
+    '''
+    Builds the shapely geometry of feature i of a polygon index
+    '''
+    polygons = []
+    for p in range(index["feature_offsets"][i], index["feature_offsets"][i + 1]):
+        rings = [
+            index["coords"][index["ring_offsets"][r]:index["ring_offsets"][r + 1]]
+            for r in range(index["polygon_offsets"][p], index["polygon_offsets"][p + 1])
+        ]
+        polygons.append(Polygon(rings[0], rings[1:]))
+    if len(polygons) == 1:
+        return polygons[0]
+    return MultiPolygon(polygons)
+
+def _grid(bounds, zoom):
+    '''
+    Maps every tile of zoom to the features whose bounds touch it
+    '''
+    grid = {}
+    for i, feature_bounds in enumerate(bounds):
+        if np.isnan(feature_bounds).any():
+            continue
+        xs, ys = tile_range(feature_bounds, zoom)
+        for cell_x in xs:
+            for cell_y in ys:
+                grid.setdefault((cell_x, cell_y), []).append(i)
+    return {cell: np.array(ids) for cell, ids in grid.items()}
+
+def _index(layer, z):
+    '''
+    Returns the spatial index of a layer at the level of detail of the zoom
+    '''
+    level = geometry.level_for_zoom(z)
+    if (layer, level) not in _indexes:
+        with _lock:
+            if (layer, level) not in _indexes:
+                index = _polygon_index(layer, level)
+                index["grids"] = {zoom: _grid(index["bounds"], zoom) for zoom in INDEX_ZOOMS}
+                _indexes[(layer, level)] = index
+    return _indexes[(layer, level)]
+
+def warm():
+    '''
+    Builds the spatial index of every layer and level of detail, so a preloading master
+    does it once for all the workers
+    '''
+    for layer in TILE_LAYERS:
+        for z in range(MAX_ZOOM + 1):
+            _index(layer, z)
+
+def _candidates(index, z, x, y, bounds):
+    zooms = [zoom for zoom in INDEX_ZOOMS if zoom <= z]
+    if zooms:
+        shift = z - zooms[-1]
+        ids = index["grids"][zooms[-1]].get((x >> shift, y >> shift))
+        if ids is None:
+            return []
+    else:
+        ids = np.arange(len(index["bounds"]))
+    minx, miny, maxx, maxy = bounds
+    feature_bounds = index["bounds"][ids]
+    mask = (feature_bounds[:, 0] <= maxx) & (feature_bounds[:, 2] >= minx) & (feature_bounds[:, 1] <= maxy) & (feature_bounds[:, 3] >= miny)
+    return ids[mask]
+
+def _polygons(geom):
+    if isinstance(geom, Polygon):
+        return [geom]
+    if isinstance(geom, MultiPolygon):
+        return list(geom.geoms)
+    return [part for part in getattr(geom, "geoms", []) if isinstance(part, Polygon)]
+
+
+def render_tile(layer, z, x, y):
+    '''
+    Encodes the features of a layer inside tile z/x/y as a vector tile
+    '''
+    index = _index(layer, z)
+    minx, miny, maxx, maxy = tile_bounds(z, x, y)
+    pad_x = (maxx - minx) * BUFFER / mvt.EXTENT
+    pad_y = (maxy - miny) * BUFFER / mvt.EXTENT
+    bounds = (minx - pad_x, miny - pad_y, maxx + pad_x, maxy + pad_y)
+
+    features = []
+    for i in _candidates(index, z, x, y, bounds):
+        clipped = _shape(index, i).intersection(box(*bounds))
+        polygons = [
+            [_to_tile(polygon.exterior.coords, z, x, y)] + [_to_tile(ring.coords, z, x, y) for ring in polygon.interiors]
+            for polygon in _polygons(clipped) if not polygon.is_empty
+        ]
+        if polygons:
+            features.append({"id": int(i), "type": mvt.POLYGON, "geometry": polygons, "properties": _properties(index, i)})
+    return mvt.encode_layer(layer, features)
+
+@lru_cache(maxsize=TILE_CACHE_SIZE)
+def get_tile(layer, z, x, y):
+    '''
+    Returns a tile from the prebuilt pyramid when it exists, otherwise renders it
+    '''
+    path = _pyramid_path(layer, z, x, y)
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            return f.read()
+    return render_tile(layer, z, x, y)
+
+
+def layer_version(layer):
+    return data.version(*LAYER_FILES[layer])
+
+def _pyramid_path(layer, z, x, y):
+    return os.path.join(PYRAMID_DIR, layer, layer_version(layer), str(z), str(x), "%d.pbf" % y)
+
+def tile_url(layer):
+    '''
+    Returns the tile url template of a layer for a mapbox vector source. Mapbox requests
+    tiles from a web worker, which needs absolute urls: the url is relative so the figure
+    does not depend on the host, update_services_map (assets/clientside.js) adds the origin.
+    '''
+    return "%s%s/{z}/{x}/{y}.pbf?v=%s" % (URL_PREFIX, layer, layer_version(layer))
+
+def build_pyramid(max_zoom=16):
+    '''
+    Writes every non empty tile of every layer from PYRAMID_MIN_ZOOM to max_zoom to PYRAMID_DIR
+    '''
+    for layer in TILE_LAYERS:
+        for z in range(PYRAMID_MIN_ZOOM, max_zoom + 1):
+            index = _index(layer, z)
+            feature_bounds = index["bounds"][~np.isnan(index["bounds"]).any(axis=1)]
+            if len(feature_bounds) == 0:
+                continue
+            layer_bounds = (*feature_bounds[:, :2].min(axis=0), *feature_bounds[:, 2:].max(axis=0))
+            xs, ys = tile_range(layer_bounds, z)
+            for x in xs:
+                for y in ys:
+                    tile = render_tile(layer, z, x, y)
+                    if not tile:
+                        continue
+                    path = _pyramid_path(layer, z, x, y)
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    with open(path, "wb") as f:
+                        f.write(tile)
+
+
+def init_app(server):
+    '''
+    Adds the vector tiles route to the flask server
+    '''
+    @server.route(URL_PREFIX + "<layer>/<int:z>/<int:x>/<int:y>.pbf")
+    def serve_tile(layer, z, x, y):
+        if layer not in TILE_LAYERS or z > MAX_ZOOM or not (0 <= x < 2 ** z and 0 <= y < 2 ** z):
+            flask.abort(404)
+        response = flask.Response(get_tile(layer, z, x, y), mimetype="application/vnd.mapbox-vector-tile")
+        response.headers["Cache-Control"] = CACHE_CONTROL
+        return response
+
+
+if __name__ == '__main__':
+    build_pyramid(int(sys.argv[1]) if len(sys.argv) > 1 else 16)
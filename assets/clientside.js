@@ -0,0 +1,92 @@
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    implang: {
+        /*
+         * Assembles the park map from the figure built by the server for the park and the
+         * colors of the selected filter, and sets the visibility of the services trace.
+         * Changing the filter only sends the colors and the services checkbox sends nothing.
+         * The tile urls of the figure are relative and mapbox requests them from a web worker,
+         * so they get the origin of the page (behind a proxy it is the https one).
+         */
+        update_services_map: function(figure, colors, switches) {
+            if (!figure) {
+                return window.dash_clientside.no_update;
+            }
+            var park = figure.layout.meta && figure.layout.meta.park;
+            // colors of the previous park while the new ones are on their way
+            if (colors && colors.park !== park) {
+                colors = null;
+            }
+            var visible = (switches || []).indexOf("services") !== -1;
+            var data = figure.data.map(function(trace) {
+                if (trace.uid === "inegi" && colors) {
+                    return Object.assign({}, trace, {z: colors.z});
+                }
+                if (trace.name === "servicios") {
+                    return Object.assign({}, trace, {visible: visible});
+                }
+                return trace;
+            });
+            var layout = figure.layout;
+            if (layout.mapbox && layout.mapbox.layers) {
+                var mapboxLayers = layout.mapbox.layers.map(function(mapboxLayer) {
+                    if (!Array.isArray(mapboxLayer.source)) {
+                        return mapboxLayer;
+                    }
+                    var source = mapboxLayer.source.map(function(url) {
+                        return url.charAt(0) === "/" ? window.location.origin + url : url;
+                    });
+                    return Object.assign({}, mapboxLayer, {source: source});
+                });
+                layout = Object.assign({}, layout, {mapbox: Object.assign({}, layout.mapbox, {layers: mapboxLayers})});
+            }
+            if (colors) {
+                var coloraxis = Object.assign({}, layout.coloraxis, {colorbar: {title: {text: colors.title}}});
+                layout = Object.assign({}, layout, {coloraxis: coloraxis});
+            }
+            return Object.assign({}, figure, {data: data, layout: layout});
+        },
+
+        /*
+         * Adds the activities of an opened node to the services sunburst. The figure starts
+         * again from the one sent by the server when the selected parks change.
+         */
+        update_services_sunburst: function(base, children, figure) {
+            if (!base) {
+                return window.dash_clientside.no_update;
+            }
+            var selection = JSON.stringify(base.layout.meta.selection);
+            if (!figure || !figure.layout.meta || JSON.stringify(figure.layout.meta.selection) !== selection) {
+                figure = base;
+            }
+            if (!children || JSON.stringify(children.selection) !== selection) {
+                return figure;
+            }
+            var trace = figure.data[0];
+            var colors = {};
+            trace.ids.forEach(function(id, i) {
+                colors[id] = trace.marker.colors[i];
+            });
+            var ids = trace.ids.slice(), parents = trace.parents.slice(), labels = trace.labels.slice();
+            var values = trace.values.slice(), markerColors = trace.marker.colors.slice();
+            children.ids.forEach(function(id, i) {
+                if (id in colors) {
+                    return;
+                }
+                // an activity takes the color of its park
+                ids.push(id);
+                parents.push(children.parents[i]);
+                labels.push(children.labels[i]);
+                values.push(children.values[i]);
+                markerColors.push(colors[children.parents[i]]);
+            });
+            if (ids.length === trace.ids.length) {
+                return figure;
+            }
+            trace = Object.assign({}, trace, {
+                ids: ids, parents: parents, labels: labels, values: values,
+                marker: Object.assign({}, trace.marker, {colors: markerColors})
+            });
+            return Object.assign({}, figure, {data: [trace]});
+        }
+    }
+});
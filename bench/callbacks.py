@@ -0,0 +1,153 @@
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+import argparse
+import subprocess
+import statistics
+from bench import synthetic
+
+# Times the import of the app and every callback against synthetic src_files of every
+# scale, to see how each path grows from one sector to the whole city:
+#   python -m bench.callbacks [--scales sector,district,city] [--repeat 10] > bench.json
+# Every scale runs in its own interpreter with empty caches and the caches of the
+# responses off: no memoization (MEMO_BACKEND=off), no kept responses (FIGURE_CACHE=off)
+# and the page layout built again for every request, so the times are the work of the
+# callbacks. The calls of a callback cycle over parks (from most to fewest services),
+# filters and top N. The json goes to stdout and a summary table to stderr.
+
+# values of the radio items and dropdowns of apps.itesm
+RADIO_FILTERS = ["viviendas", "población", "mujeres", "hombres", "area", "densidad poblacional"]
+RANKING_FILTERS = ["POBTOT", "VIVTOT", "densidad poblacional", "cantidad de servicios", "TIPOLOGIA", "ranking"]
+SUNBURST_TOPS = [3, 5, 10, 15, 20]
+
+
+def _request(output, inputs, state=None):
+    '''
+    Body of a /_dash-update-component request, inputs and state are {"id.property": value}
+    '''
+    def props(values):
+        return [{"id": key.split(".")[0], "property": key.split(".")[1], "value": value} for key, value in (values or {}).items()]
+    component_id, component_property = output.split(".")
+    return {
+        "output": output,
+        "outputs": {"id": component_id, "property": component_property},
+        "inputs": props(inputs),
+        "state": props(state),
+        "changedPropIds": [list(inputs)[0]],
+    }
+
+def cases(callbacks, variants=10):
+    '''
+    Requests of every callback, up to variants of each one: parks spread over the services
+    ranking, every filter and top N
+    '''
+    order = callbacks.services_park_order
+    parks = [order[i * len(order) // variants] for i in range(min(variants, len(order)))]
+    branches = callbacks.services_sunburst['branch_ids'][:variants]
+    tops = [{"sunburst_services_top.value": top, "sunburst_services_type.value": is_top} for is_top in [True, False] for top in SUNBURST_TOPS]
+    requests = [("page-content.children", {"url.pathname": "/apps/radiografia-urbana"}, None)]
+    requests += [("map_services_by_park_base.data", {"select_service_by_park.value": park}, None) for park in parks]
+    requests += [
+        ("map_services_by_park_colors.data", {"select_service_by_park.value": park, "radio_filter.value": RADIO_FILTERS[i % len(RADIO_FILTERS)]}, None)
+        for i, park in enumerate(parks)
+    ]
+    requests += [("map_ranking_park.figure", {"radio_ranking_filter.value": value}, None) for value in RANKING_FILTERS]
+    requests += [("demographic_bar.figure", {"select_service_by_park_demo.value": park}, None) for park in parks]
+    requests += [("sunburst_services_base.data", state, None) for state in tops[:variants]]
+    requests += [
+        ("sunburst_services_children.data", {"sunburst_services.clickData": {"points": [{"id": branch}]}}, {"sunburst_services_top.value": 20, "sunburst_services_type.value": True})
+        for branch in branches
+    ]
+    return requests
+
+def run_worker(repeat):
+    '''
+    Imports the app and times every callback in this process, each call of a callback with
+    the next of its requests
+    '''
+    start = time.perf_counter()
+    import app
+    from apps import callbacks, itesm
+    report = {"import_seconds": time.perf_counter() - start, "callbacks": {}}
+
+    requests = {}
+    for output, inputs, state in cases(callbacks):
+        requests.setdefault(output, []).append(_request(output, inputs, state))
+
+    client = app.server.test_client()
+    for output, bodies in requests.items():
+        times, errors, sizes = [], 0, []
+        for i in range(repeat):
+            itesm.serve_layout.cache_clear()
+            start = time.perf_counter()
+            response = client.post("/_dash-update-component", json=bodies[i % len(bodies)])
+            times.append(time.perf_counter() - start)
+            errors += response.status_code != 200
+            sizes.append(len(response.data))
+        report["callbacks"][output] = {
+            "requests": min(repeat, len(bodies)),
+            "first_seconds": times[0],
+            "median_seconds": statistics.median(times),
+            "min_seconds": min(times),
+            "bytes": statistics.median(sizes),
+            "errors": errors,
+        }
+    return report
+
+
+def run_scale(name, sizes, repeat):
+    '''
+    Generates the src_files of a scale and benchmarks them in new interpreters
+    '''
+    directory = tempfile.mkdtemp(prefix="bench-%s-" % name)
+    try:
+        src_files = os.path.join(directory, "src_files")
+        start = time.perf_counter()
+        synthetic.generate(src_files, **sizes)
+        generate_seconds = time.perf_counter() - start
+
+        env = dict(os.environ, SRC_FILES=src_files, SRC_FILES_CACHE=os.path.join(directory, "cache"), MEMO_BACKEND="off", FIGURE_CACHE="off")
+        # the first import builds the caches of the data, like the first boot of a deploy
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "import app"], env=env, check=True, stderr=subprocess.DEVNULL)
+        cold_import_seconds = time.perf_counter() - start
+
+        result = subprocess.run(
+            [sys.executable, "-m", "bench.callbacks", "--worker", "--repeat", str(repeat)],
+            env=env, check=True, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, universal_newlines=True
+        )
+        report = json.loads(result.stdout)
+        report.update({"scale": name, "sizes": sizes, "generate_seconds": generate_seconds, "cold_import_seconds": cold_import_seconds})
+        return report
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+def summary(reports):
+    '''
+    Table of the median time in ms of every callback per scale
+    '''
+    lines = ["%-36s" % "" + "".join("%12s" % report["scale"] for report in reports)]
+    lines.append("%-36s" % "cold import (s)" + "".join("%12.2f" % report["cold_import_seconds"] for report in reports))
+    lines.append("%-36s" % "import (s)" + "".join("%12.2f" % report["import_seconds"] for report in reports))
+    for output in reports[0]["callbacks"]:
+        lines.append("%-36s" % output + "".join("%12.1f" % (report["callbacks"][output]["median_seconds"] * 1000) for report in reports))
+    return "\n".join(lines)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmarks the callbacks against synthetic data")
+    parser.add_argument("--scales", default="sector,district,city", help="comma separated names of bench.synthetic.SCALES")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(args.repeat)))
+        sys.exit()
+
+    reports = [run_scale(name, synthetic.SCALES[name], args.repeat) for name in args.scales.split(",")]
+    print(json.dumps(reports, indent=2))
+    print(summary(reports), file=sys.stderr)
@@ -0,0 +1,208 @@
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import threading
+import subprocess
+import http.client
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+
+# Load test of the Dash callbacks with recorded traffic.
+#   python -m bench.loadtest record traffic.jsonl
+#       runs the app on http://127.0.0.1:8050 and appends every /_dash-update-component
+#       body to traffic.jsonl while you use the page (park selects, radio filters, sunburst)
+#   python -m bench.loadtest cases traffic.jsonl
+#       writes the requests of bench.callbacks instead, when there is no recording
+#   python -m bench.loadtest replay traffic.jsonl [--concurrency 8] [--duration 30] [--workers 2]
+#       starts the app with gunicorn (gunicorn.conf.py) on a free port, or uses --url, and
+#       replays the bodies in a loop; reports throughput, p50/p95/p99 latency and error
+#       rate for every callback output as json on stdout and a table on stderr
+CALLBACK_URL = "/_dash-update-component"
+
+
+def record(path, port):
+    '''
+    Runs the app and appends the body of every callback request to path
+    '''
+    import flask
+    import app
+
+    lock = threading.Lock()
+
+    @app.server.before_request
+    def record_callback():
+        if flask.request.path == CALLBACK_URL:
+            body = json.dumps(flask.request.get_json(), separators=(",", ":"))
+            with lock, open(path, "a") as f:
+                f.write(body + "\n")
+
+    app.app.run_server(port=port)
+
+def write_cases(path):
+    '''
+    Writes the requests of the callback benchmark as a recording
+    '''
+    from apps import callbacks
+    from bench import callbacks as bench_callbacks
+    with open(path, "w") as f:
+        for output, inputs, state in bench_callbacks.cases(callbacks):
+            f.write(json.dumps(bench_callbacks._request(output, inputs, state), separators=(",", ":")) + "\n")
+
+
+def percentile(values, q):
+    '''
+    Nearest rank percentile of sorted values
+    '''
+    if not values:
+        return None
+    return values[min(len(values) - 1, max(0, int(round(q / 100 * len(values))) - 1))]
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def start_server(workers):
+    '''
+    Starts the app with gunicorn on a free port and waits until it answers
+    '''
+    port = _free_port()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "app:server", "-c", "gunicorn.conf.py", "--bind", "127.0.0.1:%d" % port, "--workers", str(workers)],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    for _ in range(600):
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+            connection.request("GET", "/")
+            connection.getresponse().read()
+            return process, "http://127.0.0.1:%d" % port
+        except OSError:
+            if process.poll() is not None:
+                raise RuntimeError("gunicorn exited with code %d" % process.returncode)
+            time.sleep(0.5)
+    process.terminate()
+    raise RuntimeError("the app did not start")
+
+def _connection(url):
+    '''
+    Returns a function opening a connection to the http or https url and the callback path
+    '''
+    parts = urllib.parse.urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        raise ValueError("not an http or https url: %s" % url)
+    connection_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+    # the port is None without one in the url, the connection class uses the default one
+    connect = lambda: connection_class(parts.hostname, parts.port, timeout=60)
+    return connect, parts.path.rstrip("/") + CALLBACK_URL
+
+def _post(connect, path, body):
+    connection = connect()
+    try:
+        connection.request("POST", path, body=body, headers={"Content-Type": "application/json", "Accept-Encoding": "gzip"})
+        response = connection.getresponse()
+        response.read()
+        return response.status
+    finally:
+        connection.close()
+
+def replay(bodies, url, concurrency, duration):
+    '''
+    Replays the bodies in a loop from concurrency threads for duration seconds and returns
+    the latencies and errors of every callback output
+    '''
+    connect, path = _connection(url)
+    encoded = [(body["output"], json.dumps(body).encode()) for body in bodies]
+    results = {output: {"latencies": [], "errors": 0} for output, _ in encoded}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def client(offset):
+        i = offset
+        while time.perf_counter() < deadline:
+            output, body = encoded[i % len(encoded)]
+            i += 1
+            start = time.perf_counter()
+            try:
+                ok = _post(connect, path, body) == 200
+            except (OSError, http.client.HTTPException):
+                ok = False
+            latency = time.perf_counter() - start
+            with lock:
+                results[output]["latencies"].append(latency)
+                results[output]["errors"] += not ok
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        clients = [pool.submit(client, offset * len(encoded) // concurrency) for offset in range(concurrency)]
+        # raises the exceptions of the clients instead of reporting their missing requests
+        for future in clients:
+            future.result()
+    return results, time.perf_counter() - start
+
+def report(results, elapsed, concurrency):
+    '''
+    Throughput, latency percentiles in ms and error rate of every output and of all of them
+    '''
+    def stats(latencies, errors):
+        latencies = sorted(latencies)
+        return {
+            "requests": len(latencies),
+            "throughput_rps": len(latencies) / elapsed,
+            "p50_ms": percentile(latencies, 50) * 1000 if latencies else None,
+            "p95_ms": percentile(latencies, 95) * 1000 if latencies else None,
+            "p99_ms": percentile(latencies, 99) * 1000 if latencies else None,
+            "error_rate": errors / len(latencies) if latencies else None,
+        }
+    outputs = {output: stats(result["latencies"], result["errors"]) for output, result in results.items()}
+    total = stats([latency for result in results.values() for latency in result["latencies"]], sum(result["errors"] for result in results.values()))
+    return {"concurrency": concurrency, "seconds": elapsed, "total": total, "outputs": outputs}
+
+def summary(result):
+    lines = ["%-36s%10s%10s%10s%10s%10s" % ("", "req/s", "p50 ms", "p95 ms", "p99 ms", "errors")]
+    for output, stats in sorted(result["outputs"].items()) + [("total", result["total"])]:
+        if not stats["requests"]:
+            lines.append("%-36s%10s" % (output, "-"))
+            continue
+        lines.append("%-36s%10.1f%10.1f%10.1f%10.1f%9.1f%%" % (output, stats["throughput_rps"], stats["p50_ms"], stats["p95_ms"], stats["p99_ms"], stats["error_rate"] * 100))
+    return "\n".join(lines)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Records and replays Dash callback traffic")
+    commands = parser.add_subparsers(dest="command", required=True)
+    record_parser = commands.add_parser("record", help="run the app and record the callback requests")
+    record_parser.add_argument("path")
+    record_parser.add_argument("--port", type=int, default=8050)
+    cases_parser = commands.add_parser("cases", help="write the requests of bench.callbacks")
+    cases_parser.add_argument("path")
+    replay_parser = commands.add_parser("replay", help="replay a recording")
+    replay_parser.add_argument("path")
+    replay_parser.add_argument("--url", help="running app to test, by default one is started with gunicorn")
+    replay_parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", 2)), help="gunicorn workers of the started app")
+    replay_parser.add_argument("--concurrency", type=int, default=8)
+    replay_parser.add_argument("--duration", type=float, default=30)
+    args = parser.parse_args()
+
+    if args.command == "record":
+        record(args.path, args.port)
+    elif args.command == "cases":
+        write_cases(args.path)
+    else:
+        with open(args.path) as f:
+            bodies = [json.loads(line) for line in f if line.strip()]
+        server, url = None, args.url
+        if url is None:
+            server, url = start_server(args.workers)
+        try:
+            results, elapsed = replay(bodies, url, args.concurrency, args.duration)
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait()
+        result = report(results, elapsed, args.concurrency)
+        print(json.dumps(result, indent=2))
+        print(summary(result), file=sys.stderr)
@@ -0,0 +1,153 @@
+import os
+import sys
+import json
+import math
+import random
+import argparse
+import pandas as pd
+
+# Synthetic src_files with the same files and columns as the real ones, to measure the app
+# without the private data. The numbers are random, the shapes are regular polygons on a
+# grid around sector K1, but every join of the app (park names, av_union, CVEGEO, denue
+# ids) is consistent:
+#   python -m bench.synthetic <output dir> [--parks N] [--agebs N] [--denue N] [--seed N]
+
+# sizes of the presets used by bench.callbacks, from one sector to the whole city
+SCALES = {
+    "sector": {"parks": 30, "agebs": 60, "denue": 600},
+    "district": {"parks": 250, "agebs": 500, "denue": 10000},
+    "city": {"parks": 1500, "agebs": 2500, "denue": 100000},
+}
+
+CENTER = (-100.4068, 25.6732)
+AGEB_SIZE = 0.004 # degrees, about 400 m
+NEAR_AGEBS = 0.005 # parks get the population of the agebs whose center is this close
+TIPOLOGIAS = ["PARQUE", "PLAZA", "CAMELLON", "JARDIN"]
+ACTIVITIES = ["Tienda", "Farmacia", "Escuela", "Restaurante", "Gimnasio", "Banco", "Papeleria", "Consultorio", "Lavandería", "Panadería"]
+# names the app looks for
+PARK_NAMES = ["PARQUE VERDE LIMON", "ÁREA DEP. MANUEL J. CLOUTHIER (CORREGIDORA-CROMO)"]
+AGE_COLUMNS = ['P_0A2', 'P_3A5', 'P_6A11', 'P_8A14', 'P_15A17', 'P_18A24', 'P_60YMAS']
+AGE_SEX_COLUMNS = ['P_0A2', 'P_3A5', 'P_6A11', 'P_12A14', 'P_15A17', 'P_18A24', 'P_60YMAS']
+
+
+def _polygon(rng, lon, lat, radius, points=12):
+    ring = []
+    for i in range(points):
+        angle = 2 * math.pi * i / points
+        jitter = radius / 10
+        ring.append([lon + radius * math.cos(angle) + rng.uniform(-jitter, jitter), lat + radius * math.sin(angle) + rng.uniform(-jitter, jitter)])
+    ring.append(ring[0])
+    return {"type": "Polygon", "coordinates": [ring]}
+
+def _square(lon, lat, half):
+    return {"type": "Polygon", "coordinates": [[[lon - half, lat - half], [lon + half, lat - half], [lon + half, lat + half], [lon - half, lat + half], [lon - half, lat - half]]]}
+
+def _confidential(rng, value):
+    # inegi hides small values with "*"
+    return "*" if rng.random() < 0.05 else value
+
+
+def generate(output, parks=30, agebs=60, denue=600, seed=0):
+    '''
+    Writes every src_files file to output
+    '''
+    rng = random.Random(seed)
+    os.makedirs(output, exist_ok=True)
+
+    ## agebs on a square grid
+    side = max(1, math.ceil(math.sqrt(agebs)))
+    origin = (CENTER[0] - side * AGEB_SIZE / 2, CENTER[1] - side * AGEB_SIZE / 2)
+    ageb_centers = []
+    for i in range(agebs):
+        cvegeo = "1903900%06d" % i
+        ageb_centers.append((cvegeo, origin[0] + (i % side + 0.5) * AGEB_SIZE, origin[1] + (i // side + 0.5) * AGEB_SIZE))
+    inegi_features = [
+        {"type": "Feature", "properties": {"CVEGEO": cvegeo}, "geometry": _square(lon, lat, AGEB_SIZE / 2)}
+        for cvegeo, lon, lat in ageb_centers
+    ]
+
+    ## parks anywhere inside the agebs
+    names = (PARK_NAMES + ["PARQUE %d" % i for i in range(parks)])[:parks]
+    park_rows = []
+    for union, name in enumerate(names):
+        lon = origin[0] + rng.random() * side * AGEB_SIZE
+        lat = origin[1] + rng.random() * math.ceil(agebs / side) * AGEB_SIZE
+        park_rows.append({"UNION": union, "NOMBRE": name, "lon": lon, "lat": lat, "TIPOLOGIA": TIPOLOGIAS[union % len(TIPOLOGIAS)], "geometry": _polygon(rng, lon, lat, 0.0005 + rng.random() * 0.001)})
+    av_features = [{"type": "Feature", "properties": {"UNION": park["UNION"], "NOMBRE": park["NOMBRE"]}, "geometry": park["geometry"]} for park in park_rows]
+
+    ## population of the agebs near every park
+    inegi_rows = []
+    for park in park_rows:
+        park["POBTOT"] = park["VIVTOT"] = park["area"] = 0
+        near = [ageb for ageb in ageb_centers if abs(ageb[1] - park["lon"]) < NEAR_AGEBS and abs(ageb[2] - park["lat"]) < NEAR_AGEBS]
+        park["agebs"] = near or [min(ageb_centers, key=lambda ageb: abs(ageb[1] - park["lon"]) + abs(ageb[2] - park["lat"]))]
+        for cvegeo, _, _ in park["agebs"]:
+            row = {"NOMBRE_PARQUE": park["NOMBRE"], "inegi_cvegeo": cvegeo, "av_union": park["UNION"], "distancia": round(rng.random() * 400, 2), "area": 16000 + rng.random() * 1000}
+            for sex, total_column in [("F", "POBFEM"), ("M", "POBMAS")]:
+                total = rng.randint(50, 200)
+                for column in AGE_SEX_COLUMNS:
+                    value = rng.randint(0, 50)
+                    total += value
+                    row["%s_%s" % (column, sex)] = _confidential(rng, value)
+                row[total_column] = total
+            row["POBTOT"] = row["POBFEM"] + row["POBMAS"]
+            row["VIVTOT"] = _confidential(rng, rng.randint(10, 300))
+            for column in AGE_COLUMNS:
+                row[column] = rng.randint(0, 80)
+            inegi_rows.append(row)
+            park["POBTOT"] += row["POBTOT"]
+            park["VIVTOT"] += row["VIVTOT"] if row["VIVTOT"] != "*" else 0
+            park["area"] += row["area"]
+
+    ## denue points around the parks, every park gets at least one
+    denue_rows, near_rows, ranking_rows = [], [], []
+    park_of_point = list(range(len(park_rows))) + [rng.randrange(len(park_rows)) for _ in range(max(0, denue - len(park_rows)))]
+    services = [0] * len(park_rows)
+    for union in park_of_point:
+        services[union] += 1
+    for denue_id, union in enumerate(park_of_point):
+        park = park_rows[union]
+        activity = rng.choice(ACTIVITIES)
+        lon = park["lon"] + rng.uniform(-0.003, 0.003)
+        lat = park["lat"] + rng.uniform(-0.003, 0.003)
+        distance = round(rng.random() * 400, 2)
+        denue_rows.append({"id": denue_id, "codigo_act": ACTIVITIES.index(activity), "nombre_act": activity, "latitud": lat, "longitud": lon, "ageb": rng.choice(park["agebs"])[0]})
+        near_rows.append({"av_union": union, "denue_id": denue_id, "distancia": distance})
+        ranking_rows.append({
+            "NOMBRE_PARQUE": park["NOMBRE"], "av_union": union, "denue_id": denue_id, "latitud": lat, "longitud": lon,
+            "nombre_act": activity, "distancia": distance, "ranking": round(rng.random() * 10, 2),
+            "SHAPE_AREA": round(rng.random() * 20000, 1), "densidad poblacional": park["POBTOT"] / max(park["area"], 1),
+            "TIPOLOGIA": park["TIPOLOGIA"], "cantidad de servicios": services[union], "POBTOT": park["POBTOT"],
+            "VIVTOT": park["VIVTOT"], "area": park["area"], "distancia promedio a los servicios": round(rng.random() * 400, 0),
+            "tamano_mts": rng.random() * 20000,
+        })
+
+    ## write the files
+    def write_json(filename, content):
+        with open(os.path.join(output, filename), "w") as f:
+            json.dump(content, f)
+
+    write_json("sector_k1.geojson", {"type": "FeatureCollection", "features": [{"type": "Feature", "properties": {"SECTOR": "K1"}, "geometry": _square(CENTER[0], CENTER[1], side * AGEB_SIZE / 2)}]})
+    write_json("av_k1.geojson", {"type": "FeatureCollection", "features": av_features})
+    write_json("inegi_k1.geojson", {"type": "FeatureCollection", "features": inegi_features})
+    write_json("park_names_features.json", {feature["properties"]["NOMBRE"]: [feature] for feature in av_features})
+    pd.DataFrame(denue_rows).to_csv(os.path.join(output, "denue_corregido.csv"))
+    pd.DataFrame(near_rows).to_csv(os.path.join(output, "completo_denue_av.csv"), index=False)
+    pd.DataFrame(ranking_rows).to_csv(os.path.join(output, "denue_ranking.csv"), index=False)
+    pd.DataFrame(inegi_rows).to_csv(os.path.join(output, "inegi_av_98.csv"), index=False)
+    pd.DataFrame([{"UNION": park["UNION"], "SHAPE_AREA": round(rng.random() * 20000, 1), "US_ACT2021": "AV", "NOMBRE": park["NOMBRE"], "CATEGORIA": park["TIPOLOGIA"]} for park in park_rows]).to_csv(os.path.join(output, "av_k1.csv"), index=False)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Writes synthetic src_files")
+    parser.add_argument("output")
+    parser.add_argument("--scale", choices=SCALES, help="preset sizes, the other options override them")
+    parser.add_argument("--parks", type=int)
+    parser.add_argument("--agebs", type=int)
+    parser.add_argument("--denue", type=int)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    sizes = dict(SCALES[args.scale or "sector"])
+    sizes.update({key: getattr(args, key) for key in sizes if getattr(args, key) is not None})
+    generate(args.output, seed=args.seed, **sizes)
+    print(json.dumps(dict(sizes, output=args.output)), file=sys.stderr)
@@ -0,0 +1,32 @@
+import os
+import gc
+
+# gunicorn settings, read by default from the working directory:
+#   gunicorn app:server
+# With GUNICORN_PRELOAD (the default) the master imports the app, loads the data and warms
+# the caches before forking, so the workers share those pages copy-on-write instead of
+# every worker parsing the files again. The parsed geojson files are dropped once the
+# layers are encoded and the tile indexes (coordinate and property arrays) are built, and
+# freezing the garbage collector keeps the workers from writing to the shared objects when
+# they collect. /memory-stats and
+#   python -m apps.procmem <master pid>
+# report the unique memory (USS) of every worker, which is what one more worker costs.
+# the port and the number of workers come from PORT and WEB_CONCURRENCY as usual
+preload_app = os.getenv("GUNICORN_PRELOAD", "true").lower() not in ("0", "false", "no")
+
+
+def when_ready(server):
+    if not preload_app:
+        return
+    from apps import data, layers, tiles, itesm, procmem
+    layers.warm()
+    tiles.warm()
+    itesm.serve_layout()
+    data.release_json()
+    gc.collect()
+    gc.freeze()
+    server.log.info("Data preloaded, master memory: %s", procmem.usage())
+
+def post_worker_init(worker):
+    from apps import procmem
+    worker.log.info("Worker %s memory: %s", worker.pid, procmem.usage())
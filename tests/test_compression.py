@@ -0,0 +1,135 @@
+import gzip
+import json
+import threading
+import unittest
+from unittest import mock
+import dash
+import dash_html_components as html
+from dash.dependencies import Input, Output
+from apps import compression, figure_cache
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Tests of apps.compression and apps.figure_cache through the callback route of a small
+# Dash app: "cached.children" is cached by figure_cache, "plain.children" is not.
+
+
+def _decompress(body, encoding):
+    if encoding == "br":
+        return brotli.decompress(body)
+    if encoding == "gzip":
+        return gzip.decompress(body)
+    return body
+
+def _wait_best_level():
+    # the best level thread runs its jobs in order
+    compression._best_level.submit(lambda: None).result()
+
+
+class CompressionTestCase(unittest.TestCase):
+    def setUp(self):
+        patch = mock.patch.object(figure_cache, "FIGURE_CACHE", True)
+        patch.start()
+        self.addCleanup(patch.stop)
+        self.calls = []
+
+        app = dash.Dash(__name__)
+        app.layout = html.Div([html.Div(id="in"), html.Div(id="cached"), html.Div(id="plain")])
+        compression.init_app(app.server)
+
+        @app.callback(Output("cached", "children"), [Input("in", "children")])
+        def cached(value):
+            self.calls.append(value)
+            return ["%s %d" % (value, i) for i in range(value)]
+        self.cached = figure_cache.cache_responses(app, "cached.children", maxsize=2)
+
+        @app.callback(Output("plain", "children"), [Input("in", "children")])
+        def plain(value):
+            return ["%s %d" % (value, i) for i in range(value)]
+        self.client = app.server.test_client()
+
+    def post(self, output, value, accept_encoding=None):
+        body = {
+            "output": output,
+            "outputs": {"id": output.split(".")[0], "property": "children"},
+            "inputs": [{"id": "in", "property": "children", "value": value}],
+            "changedPropIds": ["in.children"],
+        }
+        headers = {"Accept-Encoding": accept_encoding} if accept_encoding else {}
+        return self.client.post(compression.CALLBACK_URL, data=json.dumps(body), content_type="application/json", headers=headers)
+
+    def assertResponse(self, response, encoding, value):
+        self.assertEqual(response.headers.get("Content-Encoding"), encoding)
+        self.assertIn("Accept-Encoding", response.headers.get("Vary", ""))
+        [output] = json.loads(_decompress(response.get_data(), encoding))["response"].values()
+        self.assertEqual(output["children"], ["%s %d" % (value, i) for i in range(value)])
+
+
+class TestCompression(CompressionTestCase):
+    def test_encodings(self):
+        for accept_encoding, encoding in [("gzip, deflate, br", compression.ENCODINGS[0]), ("gzip", "gzip"), (None, None), ("deflate", None)]:
+            self.assertResponse(self.post("plain.children", 200, accept_encoding), encoding, 200)
+
+    def test_small_responses_are_not_compressed(self):
+        self.assertResponse(self.post("plain.children", 2, "gzip"), None, 2)
+
+    def test_choose_encoding(self):
+        self.assertEqual(compression.choose_encoding(["gzip"]), "gzip")
+        self.assertIsNone(compression.choose_encoding(["deflate"]))
+
+
+class TestFigureCache(CompressionTestCase):
+    def test_responses_are_cached(self):
+        for _ in range(3):
+            self.assertResponse(self.post("cached.children", 300), None, 300)
+        self.assertEqual(self.calls, [300])
+
+    def test_cache_is_bounded(self):
+        for value in [300, 301, 302, 300]:
+            self.post("cached.children", value)
+        self.assertEqual(self.calls, [300, 301, 302, 300])
+
+    def test_best_level_off_the_request(self):
+        encoding = compression.ENCODINGS[0]
+        first = self.post("cached.children", 300, encoding)
+        self.assertResponse(first, encoding, 300)
+        body = _decompress(first.get_data(), encoding)
+        # the first request is compressed at the fast level, the best one comes in the background
+        self.assertEqual(first.get_data(), compression.compress(body, encoding))
+        _wait_best_level()
+        best = compression.compress(body, encoding, best=True)
+        with mock.patch.object(compression, "compress", side_effect=AssertionError("compressed in the request")):
+            second = self.post("cached.children", 300, encoding)
+        self.assertEqual(second.get_data(), best)
+        self.assertEqual(self.calls, [300])
+
+    def test_concurrent_first_requests(self):
+        encodings = {}
+        body = json.dumps(list(range(1000))).encode()
+        barrier = threading.Barrier(4)
+        compress = compression.compress
+        levels = []
+
+        def counted_compress(body, encoding, best=False):
+            levels.append(best)
+            if not best:
+                barrier.wait(5) # every request compresses before any of them keeps its body
+            return compress(body, encoding, best)
+
+        with mock.patch.object(compression, "compress", side_effect=counted_compress):
+            threads = [threading.Thread(target=compression._kept, args=(encodings, body, "gzip")) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            _wait_best_level()
+        # one of the fast bodies is kept and compressed once at the best level
+        self.assertEqual(sorted(levels), [False] * 4 + [True])
+        self.assertEqual(encodings["gzip"], compress(body, "gzip", best=True))
+
+
+if __name__ == '__main__':
+    unittest.main()
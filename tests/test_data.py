@@ -0,0 +1,133 @@
+import os
+import json
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest import mock
+import numpy as np
+import pandas as pd
+from apps import data
+
+# Tests of apps.data over a small src_files directory written for every test.
+
+SQUARE = [[[-100.30, 25.60], [-100.30, 25.61], [-100.29, 25.61], [-100.29, 25.60], [-100.30, 25.60]]]
+
+
+def _call(func, *args, timeout=10):
+    '''
+    Runs func in a thread and fails instead of hanging when it does not return
+    '''
+    result = {}
+    thread = threading.Thread(target=lambda: result.setdefault("value", func(*args)), daemon=True)
+    thread.start()
+    thread.join(timeout)
+    if thread.is_alive():
+        raise AssertionError("%s%r did not return in %d seconds" % (func.__name__, args, timeout))
+    return result["value"]
+
+
+class DataTestCase(unittest.TestCase):
+    '''
+    Points apps.data to a temporary src_files with one geojson and one csv
+    '''
+    def setUp(self):
+        self.src = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.src)
+        with open(os.path.join(self.src, "av_k1.geojson"), "w") as f:
+            json.dump({"type": "FeatureCollection", "features": [
+                {"type": "Feature", "properties": {"id": 1}, "geometry": {"type": "Polygon", "coordinates": SQUARE}},
+            ]}, f)
+        with open(os.path.join(self.src, "inegi_av_98.csv"), "w") as f:
+            f.write("NOMBRE_PARQUE,POBTOT,P_0A2\nParque A,10,*\n,5,3\nParque B,,1\n")
+
+        patches = [
+            mock.patch.object(data, "SRC_FILES", self.src),
+            mock.patch.object(data, "CACHE_DIR", os.path.join(self.src, ".cache")),
+            mock.patch.object(data, "JSON_FILES", {"av_k1": "av_k1.geojson"}),
+            mock.patch.object(data, "CSV_FILES", {"inegi_av_98": "inegi_av_98.csv"}),
+        ]
+        for state in [data._json, data._frames, data._tables, data._simplified, data._file_hashes]:
+            patches.append(mock.patch.dict(state, clear=True))
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+
+class TestRelease(DataTestCase):
+    def test_reload_after_release(self):
+        data.load()
+        features = data.geojson("av_k1")["features"]
+        data.release_json()
+        self.assertEqual(data._json, {})
+        # the simplified level reads the released level 0 file again under the same lock
+        simplified = _call(data.geojson, "av_k1", 1)
+        self.assertEqual(len(simplified["features"]), len(features))
+        self.assertEqual(_call(data.geojson, "av_k1")["features"], features)
+
+    def test_simplified_from_cache_after_release(self):
+        data.load()
+        built = data.geojson("av_k1", 2)
+        data.release_json()
+        self.assertEqual(_call(data.geojson, "av_k1", 2), built)
+
+
+class TestFrame(DataTestCase):
+    def test_clean_inegi(self):
+        df = data.frame("inegi_av_98")
+        self.assertEqual(df["POBTOT"].tolist(), [10, 5, 0])
+        self.assertEqual(df["P_0A2"].tolist(), [0, 3, 1])
+        # the text columns keep their missing values
+        self.assertEqual(df["NOMBRE_PARQUE"].isna().tolist(), [False, True, False])
+
+    def test_numeric_values_are_read_only(self):
+        df = data.frame("inegi_av_98")
+        with self.assertRaises(ValueError):
+            df.loc[0, "POBTOT"] = 1
+        df["POBTOT"] = df["POBTOT"] * 2
+        df["new"] = 1
+        self.assertEqual(data.frame("inegi_av_98")["POBTOT"].tolist(), [10, 5, 0])
+        self.assertNotIn("new", data.frame("inegi_av_98").columns)
+
+
+class TestVersion(DataTestCase):
+    def test_hashes_are_kept_in_sidecars(self):
+        first = data.version()
+        data._file_hashes.clear()
+        # a new process with the same files reads the hashes from the sidecars
+        with mock.patch.object(data, "_file_hash", side_effect=AssertionError("hashed again")):
+            self.assertEqual(data.version(), first)
+
+    def test_changed_file(self):
+        first = data.version()
+        data._file_hashes.clear()
+        with open(os.path.join(self.src, "inegi_av_98.csv"), "a") as f:
+            f.write("Parque C,1,1\n")
+        self.assertNotEqual(data.version(), first)
+
+
+class TestPartition(unittest.TestCase):
+    def assertPartition(self, result, expected):
+        self.assertEqual({value: list(positions) for value, positions in result.items()}, expected)
+
+    def test_positions_keep_row_order(self):
+        df = pd.DataFrame({"a": ["y", "x", "y", "z", "x"]}, index=[10, 11, 12, 13, 14])
+        rows = data.partition(df, "a")
+        self.assertPartition(rows, {"x": [1, 4], "y": [0, 2], "z": [3]})
+        self.assertEqual(list(df.iloc[rows["x"]].index), [11, 14])
+
+    def test_missing_values_are_left_out(self):
+        df = pd.DataFrame({"a": ["x", np.nan, "y", np.nan, "x"]})
+        self.assertPartition(data.partition(df, "a"), {"x": [0, 4], "y": [2]})
+
+    def test_mixed_types(self):
+        df = pd.DataFrame({"a": ["x", 0, "y", 0, 3.5]})
+        self.assertPartition(data.partition(df, "a"), {"x": [0], 0: [1, 3], "y": [2], 3.5: [4]})
+
+    def test_numbers_and_empty(self):
+        self.assertPartition(data.partition(pd.DataFrame({"a": [2, 1, 2]}), "a"), {1: [1], 2: [0, 2]})
+        self.assertEqual(data.partition(pd.DataFrame({"a": []}), "a"), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
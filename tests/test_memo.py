@@ -0,0 +1,118 @@
+import os
+import json
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+import plotly.graph_objects as go
+from apps import memo
+
+# Tests of apps.memo with the memory and filesystem backends in a temporary MEMO_DIR.
+
+VERSION = "0123456789ab-0123456789ab"
+
+
+class MemoTestCase(unittest.TestCase):
+    def setUp(self):
+        self.memo_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.memo_dir)
+        patches = [
+            mock.patch.object(memo, "MEMO_DIR", self.memo_dir),
+            mock.patch.object(memo, "_version", VERSION),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.calls = []
+
+    def memoize(self, func, **kwargs):
+        # every test gets its own cache names
+        name = "%s.%s" % (self.id(), func.__name__)
+        memo._names.discard(name)
+        self.addCleanup(memo._names.discard, name)
+        return memo.memoize(name=name, **kwargs)(func)
+
+    def figure(self, x):
+        self.calls.append(x)
+        return go.Figure(go.Bar(x=[x], y=[1]))
+
+    def square(self, x):
+        self.calls.append(x)
+        return {"x": x, "square": x * x}
+
+
+class TestMemoize(MemoTestCase):
+    def test_hit_and_miss_return_the_same_type(self):
+        for backend in ["memory", "filesystem"]:
+            figure = self.memoize(self.figure, backend=backend)
+            miss, hit = figure(backend), figure(backend)
+            self.assertIsInstance(miss, dict)
+            self.assertEqual(miss, hit)
+            self.assertEqual(miss["data"][0]["x"], [backend])
+        self.assertEqual(self.calls, ["memory", "filesystem"])
+
+    def test_encoded(self):
+        square = self.memoize(self.square, backend="memory")
+        self.assertEqual(json.loads(square.encoded(3).data), {"x": 3, "square": 9})
+        self.assertEqual(json.loads(square.encoded(3).data), square(3))
+        self.assertEqual(self.calls, [3])
+
+    def test_ttl(self):
+        square = self.memoize(self.square, backend="memory", ttl=10)
+        with mock.patch("time.time", return_value=1000):
+            square(2)
+            square(2)
+        with mock.patch("time.time", return_value=1011):
+            square(2)
+        self.assertEqual(self.calls, [2, 2])
+        name = "%s.%s" % (self.id(), "square")
+        self.assertEqual(memo.stats()[name]["expired"], 1)
+
+    def test_memory_lru(self):
+        square = self.memoize(self.square, backend="memory", maxsize=2)
+        for x in [1, 2, 1, 3, 1, 2]:
+            square(x)
+        # 2 was the least recently used when 3 came in
+        self.assertEqual(self.calls, [1, 2, 3, 2])
+
+    def test_filesystem_lru(self):
+        square = self.memoize(self.square, backend="filesystem", maxsize=2)
+        directory = os.path.join(self.memo_dir, VERSION, "%s.%s" % (self.id(), "square"))
+        for i, x in enumerate([1, 2, 1, 3]):
+            square(x)
+            # the modification times are the last uses, one second apart
+            for filename in os.listdir(directory):
+                path = os.path.join(directory, filename)
+                if os.stat(path).st_mtime_ns > 10 ** 9 * 1000:
+                    os.utime(path, (i + 1, i + 1))
+        self.assertEqual(len(os.listdir(directory)), 2)
+        square(1)
+        square(2)
+        self.assertEqual(self.calls, [1, 2, 3, 2])
+
+
+class TestOldVersions(MemoTestCase):
+    def version_dir(self, version, days_ago):
+        directory = os.path.join(self.memo_dir, version, "callbacks.figure")
+        os.makedirs(directory)
+        used = memo.time.time() - days_ago * 24 * 3600
+        for path in [directory, os.path.dirname(directory)]:
+            os.utime(path, (used, used))
+        return os.path.dirname(directory)
+
+    def test_only_unused_versions_are_removed(self):
+        unused = self.version_dir("aaaaaaaaaaaa-aaaaaaaaaaaa", memo.MEMO_KEEP_DAYS + 1)
+        in_use = self.version_dir("bbbbbbbbbbbb-bbbbbbbbbbbb", 0.5)
+        other = os.path.join(self.memo_dir, "other")
+        os.makedirs(other)
+        os.utime(other, (0, 0))
+        with mock.patch.object(memo, "_removed_versions", False):
+            self.memoize(self.square, backend="filesystem")
+        self.assertFalse(os.path.exists(unused))
+        self.assertTrue(os.path.exists(in_use))
+        self.assertTrue(os.path.exists(other))
+        self.assertTrue(os.path.isdir(os.path.join(self.memo_dir, VERSION)))
+
+
+if __name__ == '__main__':
+    unittest.main()
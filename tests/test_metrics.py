@@ -0,0 +1,63 @@
+import json
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+import dash
+import dash_html_components as html
+from dash.dependencies import Input, Output
+from apps import metrics
+
+# Tests of apps.metrics through the callback route of a small Dash app.
+
+
+def _request(output, value):
+    return {
+        "output": output,
+        "outputs": {"id": "out", "property": "children"},
+        "inputs": [{"id": "in", "property": "children", "value": value}],
+        "changedPropIds": ["in.children"],
+    }
+
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        metrics_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, metrics_dir)
+        patches = [
+            mock.patch.object(metrics, "METRICS_DIR", metrics_dir),
+            mock.patch.dict(metrics._histograms, {name: {} for name in metrics.HISTOGRAMS}),
+            mock.patch.dict(metrics._counters, {name: {} for name in metrics.COUNTERS}),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+        app = dash.Dash(__name__)
+        app.layout = html.Div([html.Div(id="in"), html.Div(id="out")])
+        metrics.init_app(app)
+
+        @app.callback(Output("out", "children"), [Input("in", "children")])
+        def echo(value):
+            return value
+        self.client = app.server.test_client()
+
+    def post(self, body):
+        return self.client.post(metrics.CALLBACK_URL, data=json.dumps(body), content_type="application/json")
+
+    def test_records_registered_outputs(self):
+        self.assertEqual(self.post(_request("out.children", "a")).status_code, 200)
+        text = self.client.get(metrics.METRICS_URL).get_data(as_text=True)
+        self.assertIn('dash_callback_requests_total{cache="none",output="out.children",status="200"} 1', text)
+        self.assertIn('dash_callback_compute_seconds_count{output="out.children"} 1', text)
+
+    def test_unknown_outputs_share_one_label(self):
+        for i in range(3):
+            self.post(_request("made-up-%d.children" % i, "a"))
+        text = self.client.get(metrics.METRICS_URL).get_data(as_text=True)
+        self.assertNotIn("made-up", text)
+        self.assertEqual(sum(value for key, value in metrics._counters["dash_callback_requests_total"].items() if dict(key)["output"] == "unknown"), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
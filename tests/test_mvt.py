@@ -0,0 +1,150 @@
+import unittest
+from apps import mvt
+
+# Round trip of apps.mvt: the tiles are decoded with a small protobuf reader and the
+# geometry commands are turned back into points and rings.
+#   python -m pytest tests  or  python -m unittest discover tests
+
+
+def _read_varint(data, i):
+    value, shift = 0, 0
+    while True:
+        byte = data[i]
+        i += 1
+        value |= (byte & 0x7F) << shift
+        shift += 7
+        if not byte & 0x80:
+            return value, i
+
+def _fields(data):
+    '''
+    Returns the (field, value) pairs of a protobuf message, values are ints or bytes
+    '''
+    fields, i = [], 0
+    while i < len(data):
+        key, i = _read_varint(data, i)
+        field, wire_type = key >> 3, key & 0x7
+        if wire_type == 0:
+            value, i = _read_varint(data, i)
+        elif wire_type == 1:
+            value, i = data[i:i + 8], i + 8
+        elif wire_type == 2:
+            length, i = _read_varint(data, i)
+            value, i = data[i:i + length], i + length
+        else:
+            raise ValueError("unexpected wire type %d" % wire_type)
+        fields.append((field, value))
+    return fields
+
+def _packed(data):
+    values, i = [], 0
+    while i < len(data):
+        value, i = _read_varint(data, i)
+        values.append(value)
+    return values
+
+def _unzigzag(value):
+    return (value >> 1) ^ -(value & 1)
+
+def _geometry(commands):
+    '''
+    Decodes the commands into a list of paths, every MoveTo starts a new one
+    '''
+    paths, cursor, i = [], (0, 0), 0
+    while i < len(commands):
+        command, count = commands[i] & 0x7, commands[i] >> 3
+        i += 1
+        if command == 7:
+            paths[-1].append("close")
+            continue
+        for _ in range(count):
+            cursor = (cursor[0] + _unzigzag(commands[i]), cursor[1] + _unzigzag(commands[i + 1]))
+            i += 2
+            if command == 1:
+                paths.append([cursor])
+            else:
+                paths[-1].append(cursor)
+    return paths
+
+def _decode(tile):
+    [(field, layer)] = _fields(tile)
+    layer = _fields(layer)
+    keys = [value.decode() for field, value in layer if field == 3]
+    values = [_fields(value)[0] for field, value in layer if field == 4]
+    features = []
+    for field, value in layer:
+        if field != 2:
+            continue
+        feature = dict(_fields(value))
+        tags = _packed(feature.get(2, b""))
+        properties = {}
+        for key, value_index in zip(tags[::2], tags[1::2]):
+            value_field, value = values[value_index]
+            properties[keys[key]] = value.decode() if value_field == 1 else _unzigzag(value) if value_field == 6 else value
+        features.append({"id": feature.get(1), "type": feature[3], "commands": _packed(feature[4]), "properties": properties})
+    return dict(layer)[1].decode(), dict(layer)[5], features
+
+
+class TestEncoding(unittest.TestCase):
+    def test_zigzag(self):
+        for value, encoded in [(0, 0), (-1, 1), (1, 2), (-2, 3), (2, 4), (2 ** 31 - 1, 2 ** 32 - 2), (-2 ** 31, 2 ** 32 - 1)]:
+            self.assertEqual(mvt._zigzag(value), encoded)
+            self.assertEqual(_unzigzag(encoded), value)
+
+    def test_command(self):
+        self.assertEqual(mvt._command(mvt._MOVE_TO, 1), 9)
+        self.assertEqual(mvt._command(mvt._LINE_TO, 3), 26)
+        self.assertEqual(mvt._command(mvt._CLOSE_PATH, 1), 15)
+
+    def test_varint(self):
+        for value in [0, 1, 127, 128, 300, 2 ** 35]:
+            self.assertEqual(_read_varint(mvt._varint(value), 0), (value, len(mvt._varint(value))))
+
+
+class TestLayer(unittest.TestCase):
+    def test_points(self):
+        tile = mvt.encode_layer("denue", [
+            {"id": 7, "type": mvt.POINT, "geometry": [[25, 17], [3, 4000]], "properties": {"nombre_act": "Comercio", "id": -5, "empty": None}},
+        ])
+        name, extent, [feature] = _decode(tile)
+        self.assertEqual((name, extent), ("denue", mvt.EXTENT))
+        self.assertEqual(feature["id"], 7)
+        self.assertEqual(feature["type"], mvt.POINT)
+        self.assertEqual(feature["commands"][0], mvt._command(mvt._MOVE_TO, 2))
+        self.assertEqual(_geometry(feature["commands"]), [[(25, 17)], [(3, 4000)]])
+        self.assertEqual(feature["properties"], {"nombre_act": "Comercio", "id": -5})
+
+    def test_ring_winding(self):
+        # the exterior is given with negative area and the hole with positive area
+        exterior = [[0, 0], [0, 10], [10, 10], [10, 0], [0, 0]]
+        hole = [[2, 2], [4, 2], [4, 4], [2, 4], [2, 2]]
+        self.assertLess(mvt._ring_area(exterior), 0)
+        self.assertGreater(mvt._ring_area(hole), 0)
+        tile = mvt.encode_layer("av", [{"type": mvt.POLYGON, "geometry": [[exterior, hole]], "properties": {}}])
+        _, _, [feature] = _decode(tile)
+        rings = _geometry(feature["commands"])
+        self.assertEqual([ring[-1] for ring in rings], ["close", "close"])
+        exterior_out, hole_out = [ring[:-1] for ring in rings]
+        # the closing point is implied by ClosePath and the rings are reversed
+        self.assertEqual(len(exterior_out), 4)
+        self.assertGreater(mvt._ring_area(exterior_out), 0)
+        self.assertLess(mvt._ring_area(hole_out), 0)
+        self.assertEqual(sorted(exterior_out), sorted(tuple(point) for point in exterior[:-1]))
+        self.assertEqual(sorted(hole_out), sorted(tuple(point) for point in hole[:-1]))
+
+    def test_collapsed_rings(self):
+        line = [[0, 0], [5, 5], [10, 10], [0, 0]]
+        square = [[20, 20], [30, 20], [30, 30], [20, 30]]
+        tile = mvt.encode_layer("av", [
+            {"type": mvt.POLYGON, "geometry": [[line, square]], "properties": {}},
+            {"type": mvt.POLYGON, "geometry": [[square, [[22, 22], [22, 22], [22, 22]]]], "properties": {}},
+        ])
+        _, _, features = _decode(tile)
+        # the first polygon has a collapsed exterior, the hole of the second one is collapsed
+        self.assertEqual(len(features), 1)
+        self.assertEqual(len(_geometry(features[0]["commands"])), 1)
+        self.assertEqual(mvt.encode_layer("av", [{"type": mvt.POLYGON, "geometry": [[line]], "properties": {}}]), b"")
+
+
+if __name__ == '__main__':
+    unittest.main()
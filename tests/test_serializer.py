@@ -0,0 +1,109 @@
+import json
+import unittest
+from unittest import mock
+import numpy as np
+import plotly.graph_objects as go
+import dash
+import dash_html_components as html
+from dash.dependencies import Input, Output
+from dash.exceptions import InvalidCallbackReturnValue
+from apps import memo, serializer
+
+# Tests of apps.serializer: dumps with both encoders and the callbacks of a small Dash app
+# answered through /_dash-update-component.
+
+CALLBACK_URL = "/_dash-update-component"
+
+
+class TestDumps(unittest.TestCase):
+    def test_fragments_are_spliced(self):
+        for encoder in ["orjson", "plotly"]:
+            with mock.patch.object(serializer, "SERIALIZER", encoder):
+                fragment = serializer.Fragment('{"b":[1,2]}')
+                value = {"a": fragment, "c": [fragment, "text"], "d": np.array([1.5, 2])}
+                self.assertEqual(json.loads(serializer.dumps(value)), {"a": {"b": [1, 2]}, "c": [{"b": [1, 2]}, "text"], "d": [1.5, 2]})
+
+    def test_placeholder_like_strings_are_kept(self):
+        body = serializer.dumps({"a": "__fragment_0__", "b": serializer.Fragment("1")})
+        self.assertEqual(json.loads(body), {"a": "__fragment_0__", "b": 1})
+
+    def test_figures(self):
+        figure = go.Figure(go.Bar(x=["a"], y=[1]))
+        self.assertEqual(json.loads(serializer.dumps({"figure": figure}))["figure"]["data"][0]["x"], ["a"])
+
+    def test_not_serializable(self):
+        with self.assertRaises(TypeError):
+            serializer.dumps({"a": object()})
+
+
+class TestCallbacks(unittest.TestCase):
+    def setUp(self):
+        patch = mock.patch.object(memo, "_version", "0123456789ab-0123456789ab")
+        patch.start()
+        self.addCleanup(patch.stop)
+        name = self.id() + ".square"
+        self.addCleanup(memo._names.discard, name)
+
+        app = dash.Dash(__name__)
+        app.layout = html.Div([html.Div(id="in"), html.Div(id="a"), html.Div(id="b"), html.Div(id="c")])
+        serializer.init_app(app)
+
+        @app.callback([Output("a", "children"), Output("b", "children")], [Input("in", "children")])
+        def both(value):
+            if value == "skip":
+                return dash.no_update, value
+            if value == "invalid":
+                return object(), value
+            return {"value": value}, [value, value]
+
+        @memo.memoize(backend="memory", name=name)
+        def square(value):
+            return {"square": value * value}
+        app.callback(Output("c", "children"), [Input("in", "children")])(square)
+        app.server.config["PROPAGATE_EXCEPTIONS"] = True
+        self.client = app.server.test_client()
+
+    def post(self, outputs, value):
+        output = "..%s.." % "...".join("%s.%s" % pair for pair in outputs) if len(outputs) > 1 else "%s.%s" % outputs[0]
+        specs = [{"id": id, "property": property} for id, property in outputs]
+        body = {
+            "output": output,
+            "outputs": specs if len(outputs) > 1 else specs[0],
+            "inputs": [{"id": "in", "property": "children", "value": value}],
+            "changedPropIds": ["in.children"],
+        }
+        return self.client.post(CALLBACK_URL, data=json.dumps(body), content_type="application/json")
+
+    def test_multiple_outputs(self):
+        response = self.post([("a", "children"), ("b", "children")], "x")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json(), {"multi": True, "response": {"a": {"children": {"value": "x"}}, "b": {"children": ["x", "x"]}}})
+
+    def test_no_update(self):
+        response = self.post([("a", "children"), ("b", "children")], "skip")
+        self.assertEqual(response.get_json()["response"], {"b": {"children": "skip"}})
+
+    def test_invalid_value(self):
+        with self.assertRaises(InvalidCallbackReturnValue) as raised:
+            self.post([("a", "children"), ("b", "children")], "invalid")
+        # the message names the outputs like Dash does
+        self.assertIn("<Output `a.children`>", str(raised.exception))
+
+    def test_memoized_json_is_spliced(self):
+        for _ in range(2):
+            response = self.post([("c", "children")], 3)
+            self.assertEqual(response.get_json(), {"multi": True, "response": {"c": {"children": {"square": 9}}}})
+        self.assertEqual(memo.stats()[self.id() + ".square"]["hits"], 1)
+
+
+class TestDashVersion(unittest.TestCase):
+    def test_other_versions_keep_dash_serializer(self):
+        app = dash.Dash(__name__)
+        register = app.callback
+        with mock.patch.object(dash, "__version__", "2.0.0"), self.assertLogs(serializer.logger, "WARNING"):
+            serializer.init_app(app)
+        self.assertEqual(app.callback, register)
+
+
+if __name__ == '__main__':
+    unittest.main()
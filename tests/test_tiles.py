@@ -0,0 +1,42 @@
+import unittest
+from unittest import mock
+import numpy as np
+from apps import tiles
+
+# Tests of the spatial index of apps.tiles over random feature bounds.
+
+
+class TestCandidates(unittest.TestCase):
+    def setUp(self):
+        random = np.random.default_rng(0)
+        corners = random.uniform([-100.45, 25.55], [-100.15, 25.80], size=(500, 2))
+        sizes = random.uniform(0.0001, 0.01, size=(500, 2))
+        self.bounds = np.hstack([corners, corners + sizes])
+        self.bounds[7] = np.nan # a feature without geometry
+        self.index = {"bounds": self.bounds, "grids": {zoom: tiles._grid(self.bounds, zoom) for zoom in tiles.INDEX_ZOOMS}}
+
+    def scan(self, bounds):
+        minx, miny, maxx, maxy = bounds
+        return np.flatnonzero((self.bounds[:, 0] <= maxx) & (self.bounds[:, 2] >= minx) & (self.bounds[:, 1] <= maxy) & (self.bounds[:, 3] >= miny))
+
+    def test_grids_match_a_full_scan(self):
+        for z in range(8, 17):
+            xs, ys = tiles.tile_range((-100.45, 25.55, -100.14, 25.81), z)
+            for x in list(xs)[::max(1, len(xs) // 6)]:
+                for y in list(ys)[::max(1, len(ys) // 6)]:
+                    bounds = tiles.tile_bounds(z, x, y)
+                    self.assertEqual(sorted(tiles._candidates(self.index, z, x, y, bounds)), self.scan(bounds).tolist(), (z, x, y))
+
+    def test_low_zooms_use_a_grid(self):
+        z = tiles.INDEX_ZOOMS[1]
+        x, y = next(iter(self.index["grids"][z]))
+        # a tile of the coarse grid only looks at the features of its cell
+        with mock.patch.object(np, "arange", side_effect=AssertionError("full scan")):
+            tiles._candidates(self.index, z + 1, x * 2, y * 2, tiles.tile_bounds(z + 1, x * 2, y * 2))
+
+    def test_empty_cell(self):
+        self.assertEqual(len(tiles._candidates(self.index, 16, 0, 0, tiles.tile_bounds(16, 0, 0))), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()